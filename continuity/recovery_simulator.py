@@ -3,10 +3,78 @@ CloudCore SaaS — continuity/recovery_simulator.py
 ISO 22301:2019: Simulador de Recuperación ante Desastres
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from domain.continuity import ContinuityScenario, DisruptionType
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba es opcional: sin él se usa la reducción NumPy
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Escenarios estándar de CloudCore SaaS: (id, tipo de interrupción, probabilidad anual)
+_DEFAULT_SCENARIOS = [
+    ("ESC-001", DisruptionType.DATABASE_FAILURE, 0.15),
+    ("ESC-002", DisruptionType.RANSOMWARE,       0.08),
+    ("ESC-003", DisruptionType.CLOUD_OUTAGE,     0.12),
+    ("ESC-004", DisruptionType.NETWORK_LOSS,     0.20),
+    ("ESC-005", DisruptionType.DEPLOY_FAILURE,   0.25),
+]
+# Rangos uniformes de RTO/RPO reales (horas) y clientes afectados (cota superior exclusiva)
+_RTO_LOW      = np.array([2.5,  8.0, 1.5, 0.5, 0.5])
+_RTO_HIGH     = np.array([6.5, 24.0, 5.0, 3.0, 2.5])
+_RPO_LOW      = np.array([0.1,  1.0, 0.05, 0.0, 0.0])
+_RPO_HIGH     = np.array([0.5,  4.0, 0.3,  0.0, 0.0])
+_CLIENTS_LOW  = np.array([3000, 3000, 1500,  500, 100])
+_CLIENTS_HIGH = np.array([3001, 3001, 3001, 2001, 801])
+_DEFAULT_RPO_OBJECTIVE_H = 0.25   # 15 minutos
+
+# Tamaños mínimos de lote para el kernel JIT y su versión paralela
+_JIT_MIN_SCENARIOS      = 1_000
+_PARALLEL_MIN_SCENARIOS = 100_000
+
+
+def _summarize_numpy(actual_rto, rto_obj, actual_rpo, rpo_obj, probability, cost_per_hour):
+    """Cumplimiento RTO/RPO, impacto y riesgo residual totales con operaciones NumPy."""
+    # Escenarios sin simular (None → NaN) no cumplen y no generan impacto
+    impact   = np.nan_to_num(actual_rto) * cost_per_hour
+    residual = probability * impact
+    return (int((actual_rto <= rto_obj).sum()), int((actual_rpo <= rpo_obj).sum()),
+            float(impact.sum()), float(residual.sum()))
+
+
+if njit is not None:
+    def _summarize_loop(actual_rto, rto_obj, actual_rpo, rpo_obj, probability, cost_per_hour):
+        rto_ok, rpo_ok = 0, 0
+        total_impact, total_risk = 0.0, 0.0
+        for i in prange(actual_rto.shape[0]):
+            rto = actual_rto[i]
+            if rto <= rto_obj[i]:
+                rto_ok += 1
+            if actual_rpo[i] <= rpo_obj[i]:
+                rpo_ok += 1
+            if not np.isnan(rto):
+                impact = rto * cost_per_hour
+                total_impact += impact
+                total_risk += probability[i] * impact
+        return rto_ok, rpo_ok, total_impact, total_risk
+
+    _summarize_serial   = njit(cache=True)(_summarize_loop)
+    _summarize_parallel = njit(cache=True, parallel=True)(_summarize_loop)
+
+
+def _summarize(actual_rto, rto_obj, actual_rpo, rpo_obj, probability, cost_per_hour):
+    """Selecciona la reducción: NumPy para lotes pequeños, kernel Numba para lotes grandes."""
+    n = actual_rto.shape[0]
+    if njit is None or n < _JIT_MIN_SCENARIOS:
+        return _summarize_numpy(actual_rto, rto_obj, actual_rpo, rpo_obj, probability, cost_per_hour)
+    kernel = _summarize_parallel if n >= _PARALLEL_MIN_SCENARIOS else _summarize_serial
+    rto_ok, rpo_ok, impact, risk = kernel(actual_rto, rto_obj, actual_rpo, rpo_obj,
+                                          probability, cost_per_hour)
+    return int(rto_ok), int(rpo_ok), float(impact), float(risk)
+
 
 class RecoverySimulator:
     """
@@ -14,13 +82,18 @@ class RecoverySimulator:
     Basado en ISO 22301:2019 — Sistemas de Gestión de Continuidad del Negocio.
     """
 
-    def __init__(self, rto_minutes: int = None, rto_hours: float = 4.0):
+    def __init__(self, rto_minutes: int = None, rto_hours: float = 4.0,
+                 rng: np.random.Generator | None = None):
         # Compatible con código base del profesor (rto_minutes) y uso interno (rto_hours)
         if rto_minutes is not None:
             self.rto_hours = rto_minutes / 60
         else:
             self.rto_hours = rto_hours
+        # Generador compartido opcional; sin él, monte_carlo() usa su propia semilla
+        self._rng = rng
         self.scenarios: list[ContinuityScenario] = []
+        self._soa: dict[str, np.ndarray] | None = None
+        self._soa_key: tuple | None = None
 
     def simulate_recovery(self, actual_recovery_time: float) -> str:
         """
@@ -34,30 +107,69 @@ class RecoverySimulator:
     def add_scenario(self, scenario: ContinuityScenario):
         """Agrega un escenario de continuidad al simulador."""
         self.scenarios.append(scenario)
+        self._soa = None
 
-    def run_all(self) -> list[dict]:
-        """Ejecuta todos los escenarios y retorna resultados."""
-        results = []
-        for s in self.scenarios:
+    def _arrays(self) -> dict[str, np.ndarray]:
+        """
+        Materializa los escenarios como arreglos paralelos (SoA) para cálculo vectorizado.
+        La caché se reconstruye si cambia la lista de escenarios o la versión de alguno.
+        """
+        key = tuple((id(s), s._version) for s in self.scenarios)
+        if self._soa is None or key != self._soa_key:
+            sc = self.scenarios
+            self._soa = {
+                "actual_rto":  np.array([s.actual_rto_h for s in sc], dtype=np.float64),
+                "rto_obj":     np.array([s.rto_objective_h for s in sc], dtype=np.float64),
+                "actual_rpo":  np.array([s.actual_rpo_h for s in sc], dtype=np.float64),
+                "rpo_obj":     np.array([s.rpo_objective_h for s in sc], dtype=np.float64),
+                "probability": np.array([s.probability for s in sc], dtype=np.float64),
+            }
+            self._soa_key = key
+        return self._soa
+
+    def _eval_one(self, s: ContinuityScenario) -> dict:
+        """Registra en el log el resultado de un escenario y lo serializa."""
+        if logger.isEnabledFor(logging.WARNING):
             status_rto = "✓ CUMPLE" if s.meets_rto() else f"✗ EXCEDE (+{s.rto_gap_h():.1f}h)"
-            status_rpo = "✓ CUMPLE" if s.meets_rpo() else "✗ EXCEDE"
+            # %-formato no admite separador de miles: el impacto se formatea aquí
             logger.warning(
-                f"[CONTINUITY] {s.scenario_id} | {s.disruption_type.value} | "
-                f"RTO: {s.actual_rto_h:.2f}h {status_rto} | "
-                f"Impacto: USD {s.financial_impact_usd():,.2f}"
+                "[CONTINUITY] %s | %s | RTO: %.2fh %s | Impacto: USD %s",
+                s.scenario_id, s.disruption_type.value, s.actual_rto_h,
+                status_rto, f"{s.financial_impact_usd():,.2f}",
             )
-            results.append(s.to_dict())
-        return results
+        return s.to_dict()
+
+    def run_all(self, max_workers: int = None) -> list[dict]:
+        """
+        Ejecuta todos los escenarios y retorna resultados, en el orden de los escenarios.
+        Con max_workers > 1 la evaluación se reparte en un ThreadPoolExecutor: solo compensa
+        cuando algún handler de logging hace E/S (red o disco); el cálculo en sí queda bajo el GIL.
+        """
+        if max_workers and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(self._eval_one, self.scenarios))
+        return [self._eval_one(s) for s in self.scenarios]
+
+    def to_records(self) -> np.ndarray:
+        """
+        Exporta los escenarios como arreglo estructurado (N,) con ContinuityScenario.RECORD_DTYPE,
+        apto para análisis vectorizado (p. ej. records["financial_impact_usd"].sum()).
+        """
+        records = np.empty(len(self.scenarios), dtype=ContinuityScenario.RECORD_DTYPE)
+        for i, s in enumerate(self.scenarios):
+            records[i] = s.to_record()
+        return records
 
     def continuity_summary(self) -> dict:
         """Resumen ejecutivo de continuidad del negocio."""
         if not self.scenarios:
             return {}
-        rto_compliant = sum(1 for s in self.scenarios if s.meets_rto())
-        rpo_compliant = sum(1 for s in self.scenarios if s.meets_rpo())
-        total         = len(self.scenarios)
-        total_impact  = sum(s.financial_impact_usd() for s in self.scenarios)
-        total_risk    = sum(s.residual_risk_usd() for s in self.scenarios)
+        a = self._arrays()
+        rto_compliant, rpo_compliant, total_impact, total_risk = _summarize(
+            a["actual_rto"], a["rto_obj"], a["actual_rpo"], a["rpo_obj"],
+            a["probability"], float(ContinuityScenario.COST_PER_HOUR_USD),
+        )
+        total = len(self.scenarios)
 
         return {
             "total_scenarios":      total,
@@ -72,31 +184,64 @@ class RecoverySimulator:
             ],
         }
 
+    def monte_carlo(self, n_runs: int = 10_000, seed: int = 42) -> dict:
+        """
+        Análisis de incertidumbre sobre los 5 escenarios estándar: muestrea n_runs
+        realizaciones de RTO/RPO por escenario en matrices (5, n_runs) y evalúa
+        cumplimiento contra el RTO del simulador y el RPO estándar (15 min).
+        Retorna por escenario la probabilidad de cumplimiento y la media, p95 y CVaR 95%
+        del impacto financiero. Si el simulador tiene un generador inyectado, seed se ignora.
+        """
+        if n_runs < 1:
+            raise ValueError(f"n_runs debe ser al menos 1 (recibido {n_runs})")
+        rng  = self._rng if self._rng is not None else np.random.default_rng(seed)
+        n    = len(_DEFAULT_SCENARIOS)
+        rto  = rng.uniform(_RTO_LOW[:, None], _RTO_HIGH[:, None], size=(n, n_runs))
+        rpo  = rng.uniform(_RPO_LOW[:, None], _RPO_HIGH[:, None], size=(n, n_runs))
+        prob = np.array([p for _, _, p in _DEFAULT_SCENARIOS])
+
+        impact   = rto * ContinuityScenario.COST_PER_HOUR_USD
+        residual = prob[:, None] * impact
+        rto_ok   = (rto <= self.rto_hours).mean(axis=1)
+        rpo_ok   = (rpo <= _DEFAULT_RPO_OBJECTIVE_H).mean(axis=1)
+        p95      = np.percentile(impact, 95, axis=1)
+        # CVaR 95%: impacto medio en la cola que iguala o supera el p95
+        tail     = impact >= p95[:, None]
+        cvar     = (impact * tail).sum(axis=1) / tail.sum(axis=1)
+
+        scenarios = {}
+        for i, (sid, _, _) in enumerate(_DEFAULT_SCENARIOS):
+            scenarios[sid] = {
+                "rto_compliance_prob": round(float(rto_ok[i]), 4),
+                "rpo_compliance_prob": round(float(rpo_ok[i]), 4),
+                "impact_mean_usd":     round(float(impact[i].mean()), 2),
+                "impact_p95_usd":      round(float(p95[i]), 2),
+                "impact_cvar95_usd":   round(float(cvar[i]), 2),
+                "residual_mean_usd":   round(float(residual[i].mean()), 2),
+            }
+        return {
+            "n_runs":    n_runs,
+            "scenarios": scenarios,
+            "total_residual_risk_mean_usd": round(float(residual.sum(axis=0).mean()), 2),
+        }
+
     @staticmethod
-    def default_scenarios(seed: int = 42) -> list[ContinuityScenario]:
-        """Retorna los 5 escenarios estándar de CloudCore SaaS."""
-        import random
-        random.seed(seed)
-
-        scenarios_data = [
-            ("ESC-001", DisruptionType.DATABASE_FAILURE,  0.15, 3000,
-             random.uniform(2.5, 6.5),  random.uniform(0.1, 0.5)),
-            ("ESC-002", DisruptionType.RANSOMWARE,         0.08, 3000,
-             random.uniform(8.0, 24.0), random.uniform(1.0, 4.0)),
-            ("ESC-003", DisruptionType.CLOUD_OUTAGE,       0.12, random.randint(1500, 3000),
-             random.uniform(1.5, 5.0),  random.uniform(0.05, 0.3)),
-            ("ESC-004", DisruptionType.NETWORK_LOSS,       0.20, random.randint(500, 2000),
-             random.uniform(0.5, 3.0),  0.0),
-            ("ESC-005", DisruptionType.DEPLOY_FAILURE,     0.25, random.randint(100, 800),
-             random.uniform(0.5, 2.5),  0.0),
-        ]
+    def default_scenarios(seed: int = 42,
+                          rng: np.random.Generator | None = None) -> list[ContinuityScenario]:
+        """Retorna los 5 escenarios estándar de CloudCore SaaS (rng, si se pasa, reemplaza a seed)."""
+        if rng is None:
+            rng = np.random.default_rng(seed)
+        rto_real = rng.uniform(_RTO_LOW, _RTO_HIGH)
+        rpo_real = rng.uniform(_RPO_LOW, _RPO_HIGH)
+        clients  = rng.integers(_CLIENTS_LOW, _CLIENTS_HIGH)
+
         result = []
-        for sid, dtype, prob, clients, rto_real, rpo_real in scenarios_data:
+        for (sid, dtype, prob), rto, rpo, n_clients in zip(_DEFAULT_SCENARIOS, rto_real, rpo_real, clients):
             s = ContinuityScenario(
                 scenario_id=sid, disruption_type=dtype,
                 probability=prob, rto_objective_h=4.0,
-                rpo_objective_h=0.25, clients_affected=clients,
+                rpo_objective_h=_DEFAULT_RPO_OBJECTIVE_H, clients_affected=int(n_clients),
             )
-            s.simulate(actual_rto_h=rto_real, actual_rpo_h=rpo_real)
+            s.simulate(actual_rto_h=float(rto), actual_rpo_h=float(rpo))
             result.append(s)
         return result
@@ -3,6 +3,7 @@ CloudCore SaaS — domain/continuity.py
 ISO 22301:2019: Entidad de dominio para Continuidad del Negocio
 """
 from enum import Enum
+import numpy as np
 
 
 class DisruptionType(Enum):
@@ -21,6 +22,22 @@ class ContinuityScenario:
 
     COST_PER_HOUR_USD = 15_000   # Impacto financiero por hora de inactividad
 
+    # Registro tabular de un escenario, para exportar lotes como arreglo estructurado NumPy
+    RECORD_DTYPE = np.dtype([
+        ("scenario_id", "U16"), ("probability", "f8"),
+        ("rto_objective_h", "f8"), ("rpo_objective_h", "f8"),
+        ("actual_rto_h", "f8"), ("actual_rpo_h", "f8"),
+        ("clients_affected", "i4"), ("meets_rto", "?"), ("meets_rpo", "?"),
+        ("financial_impact_usd", "f8"), ("residual_risk_usd", "f8"),
+    ])
+
+    __slots__ = (
+        "scenario_id", "disruption_type", "_probability", "_rto_objective_h",
+        "_rpo_objective_h", "clients_affected", "_actual_rto_h", "_actual_rpo_h",
+        "_meets_rto", "_meets_rpo", "_impact", "_residual", "_rto_gap", "_type_str",
+        "_version",
+    )
+
     def __init__(self, scenario_id: str, disruption_type: DisruptionType,
                  probability: float, rto_objective_h: float,
                  rpo_objective_h: float, clients_affected: int):
@@ -32,61 +49,123 @@ class ContinuityScenario:
         """
         self.scenario_id       = scenario_id
         self.disruption_type   = disruption_type
-        self.probability       = probability
-        self.rto_objective_h   = rto_objective_h
-        self.rpo_objective_h   = rpo_objective_h
+        self._type_str         = disruption_type.value
+        self._probability      = probability
+        self._rto_objective_h  = rto_objective_h
+        self._rpo_objective_h  = rpo_objective_h
         self.clients_affected  = clients_affected
-        self.actual_rto_h      = None
-        self.actual_rpo_h      = None
+        self._actual_rto_h     = None
+        self._actual_rpo_h     = None
+        # Versión de los datos del escenario: aumenta con cada cambio que afecta a las métricas
+        self._version          = 0
+        # Métricas derivadas, precalculadas en simulate()
+        self._meets_rto        = False
+        self._meets_rpo        = False
+        self._impact           = 0.0
+        self._residual         = 0.0
+        self._rto_gap          = 0.0
+
+    @property
+    def probability(self) -> float:
+        return self._probability
+
+    @probability.setter
+    def probability(self, value: float):
+        self._probability = value
+        self._changed()
+
+    @property
+    def rto_objective_h(self) -> float:
+        return self._rto_objective_h
+
+    @rto_objective_h.setter
+    def rto_objective_h(self, value: float):
+        self._rto_objective_h = value
+        self._changed()
+
+    @property
+    def rpo_objective_h(self) -> float:
+        return self._rpo_objective_h
+
+    @rpo_objective_h.setter
+    def rpo_objective_h(self, value: float):
+        self._rpo_objective_h = value
+        self._changed()
+
+    @property
+    def actual_rto_h(self) -> float | None:
+        """RTO real en horas (None hasta simulate())."""
+        return self._actual_rto_h
+
+    @property
+    def actual_rpo_h(self) -> float | None:
+        """RPO real en horas (None hasta simulate())."""
+        return self._actual_rpo_h
 
     def simulate(self, actual_rto_h: float, actual_rpo_h: float):
-        """Registra los tiempos reales de recuperación de la simulación."""
-        self.actual_rto_h = actual_rto_h
-        self.actual_rpo_h = actual_rpo_h
+        """Registra los tiempos reales de recuperación y precalcula las métricas derivadas."""
+        self._actual_rto_h = actual_rto_h
+        self._actual_rpo_h = actual_rpo_h
+        self._changed()
+
+    def _changed(self):
+        """Incrementa la versión y, si ya se simuló, recalcula las métricas derivadas."""
+        self._version += 1
+        actual_rto_h = self._actual_rto_h
+        if actual_rto_h is None:
+            return
+        self._meets_rto = actual_rto_h <= self._rto_objective_h
+        self._meets_rpo = self._actual_rpo_h <= self._rpo_objective_h
+        self._impact    = actual_rto_h * self.COST_PER_HOUR_USD
+        self._residual  = self._probability * self._impact
+        self._rto_gap   = max(0.0, actual_rto_h - self._rto_objective_h)
 
     def meets_rto(self) -> bool:
-        if self.actual_rto_h is None:
-            return False
-        return self.actual_rto_h <= self.rto_objective_h
+        return self._meets_rto
 
     def meets_rpo(self) -> bool:
-        if self.actual_rpo_h is None:
-            return False
-        return self.actual_rpo_h <= self.rpo_objective_h
+        return self._meets_rpo
 
     def financial_impact_usd(self) -> float:
         """Impacto financiero estimado basado en el RTO real."""
-        if self.actual_rto_h is None:
-            return 0.0
-        return round(self.actual_rto_h * self.COST_PER_HOUR_USD, 2)
+        return self._impact
 
     def residual_risk_usd(self) -> float:
         """Riesgo residual anualizado = Probabilidad × Impacto."""
-        return round(self.probability * self.financial_impact_usd(), 2)
+        return self._residual
 
     def rto_gap_h(self) -> float:
         """Brecha entre RTO real y objetivo (positivo = incumplimiento)."""
-        if self.actual_rto_h is None:
-            return 0.0
-        return round(max(0.0, self.actual_rto_h - self.rto_objective_h), 2)
+        return self._rto_gap
 
     def to_dict(self) -> dict:
         return {
             "scenario_id":        self.scenario_id,
-            "disruption_type":    self.disruption_type.value,
+            "disruption_type":    self._type_str,
             "probability":        self.probability,
             "rto_objective_h":    self.rto_objective_h,
             "rpo_objective_h":    self.rpo_objective_h,
             "actual_rto_h":       self.actual_rto_h,
             "actual_rpo_h":       self.actual_rpo_h,
-            "meets_rto":          self.meets_rto(),
-            "meets_rpo":          self.meets_rpo(),
-            "rto_gap_h":          self.rto_gap_h(),
+            "meets_rto":          self._meets_rto,
+            "meets_rpo":          self._meets_rpo,
+            "rto_gap_h":          round(self._rto_gap, 2),
             "clients_affected":   self.clients_affected,
-            "financial_impact_usd": self.financial_impact_usd(),
-            "residual_risk_usd":  self.residual_risk_usd(),
+            "financial_impact_usd": round(self._impact, 2),
+            "residual_risk_usd":  round(self._residual, 2),
         }
 
+    def to_record(self) -> tuple:
+        """Tupla en el orden de RECORD_DTYPE (NaN en tiempos reales si no se ha simulado)."""
+        return (
+            self.scenario_id, self.probability,
+            self.rto_objective_h, self.rpo_objective_h,
+            np.nan if self.actual_rto_h is None else self.actual_rto_h,
+            np.nan if self.actual_rpo_h is None else self.actual_rpo_h,
+            self.clients_affected, self._meets_rto, self._meets_rpo,
+            self._impact, self._residual,
+        )
+
     def __repr__(self):
         status = "✓ RTO OK" if self.meets_rto() else f"✗ RTO +{self.rto_gap_h():.1f}h"
-        return f"<Scenario {self.scenario_id} | {self.disruption_type.value} | {status}>"
+        return f"<Scenario {self.scenario_id} | {self._type_str} | {status}>"
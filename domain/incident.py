@@ -5,6 +5,8 @@ ITIL 4: Entidad de dominio para Incidentes de Servicio
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 
 class Severity(Enum):
     CRITICAL = 1   # P1 - Sistema caído totalmente
@@ -42,80 +44,141 @@ class Incident:
         Severity.LOW:      100,
     }
 
+    __slots__ = (
+        "incident_id", "service_name", "_severity", "incident_type", "team",
+        "clients_affected", "status", "_created_at", "_created_iso", "resolved_at", "notes",
+        "_resolution_h", "_sla_limit", "_penalty_rate", "_severity_str", "_status_str",
+        "_meets_sla", "_excess_h", "_penalty_usd",
+    )
+
     def __init__(self, incident_id: str, service_name: str, severity: Severity,
-                 incident_type: str, team: str, clients_affected: int = 0):
+                 incident_type: str, team: str, clients_affected: int = 0,
+                 created_at: datetime | None = None):
+        """
+        Args:
+            created_at: Fecha de apertura; si se omite se usa el reloj del sistema.
+                        Permite reconstruir incidentes históricos sin leer el reloj.
+        """
         self.incident_id      = incident_id
         self.service_name     = service_name
-        self.severity         = severity
         self.incident_type    = incident_type
         self.team             = team
         self.clients_affected = clients_affected
         self.status           = IncidentStatus.OPEN
-        self.created_at       = datetime.now()
+        self._status_str      = self.status.value   # se actualiza en resolve()/close()
         self.resolved_at      = None
+        self.severity         = severity
+        self.created_at       = created_at or datetime.now()
         self.notes            = []
+        self._resolution_h    = None
+        # Resultado SLA: se fija en resolve(), cuando el tiempo de resolución es definitivo
+        self._meets_sla       = False
+        self._excess_h        = 0.0
+        self._penalty_usd     = 0.0
+
+    @property
+    def severity(self) -> Severity:
+        return self._severity
+
+    @severity.setter
+    def severity(self, value: Severity):
+        self._severity     = value
+        self._sla_limit    = self.SLA_HOURS[value]
+        self._penalty_rate = self.PENALTY_USD_PER_HOUR[value]
+        self._severity_str = value.name
+        if self.resolved_at is not None:
+            self._settle()
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at  = value
+        self._created_iso = None
+        if self.resolved_at is not None:
+            self._settle()
 
     def resolve(self, resolved_at: datetime = None):
-        """Marca el incidente como resuelto."""
+        """Marca el incidente como resuelto y fija su tiempo de resolución y resultado SLA."""
         self.resolved_at = resolved_at or datetime.now()
         self.status = IncidentStatus.RESOLVED
+        self._status_str = self.status.value
+        self._settle()
+
+    def _settle(self):
+        """Calcula tiempo de resolución y resultado SLA a partir de created_at y resolved_at."""
+        t = (self.resolved_at - self._created_at).total_seconds() / 3600
+        self._resolution_h = t
+        self._meets_sla    = t <= self._sla_limit
+        self._excess_h     = max(0.0, t - self._sla_limit)
+        self._penalty_usd  = self._excess_h * self._penalty_rate
 
     def close(self):
         """Cierra el incidente formalmente."""
         self.status = IncidentStatus.CLOSED
+        self._status_str = self.status.value
 
-    def add_note(self, note: str):
-        """Agrega una nota de seguimiento al incidente."""
-        self.notes.append({"timestamp": datetime.now().isoformat(), "note": note})
+    def add_note(self, note: str, at: datetime | None = None):
+        """Agrega una nota de seguimiento al incidente (at: fecha de la nota, por defecto ahora)."""
+        self.notes.append({"timestamp": (at or datetime.now()).isoformat(), "note": note})
 
     def resolution_time_hours(self) -> float:
         """Calcula el tiempo de resolución en horas."""
-        if self.resolved_at:
-            delta = self.resolved_at - self.created_at
-            return delta.total_seconds() / 3600
-        return None
+        return self._resolution_h
 
     def sla_limit_hours(self) -> int:
         """Retorna el SLA máximo de resolución según severidad."""
-        return self.SLA_HOURS[self.severity]
+        return self._sla_limit
 
     def meets_sla(self) -> bool:
         """Determina si el incidente fue resuelto dentro del SLA."""
-        t = self.resolution_time_hours()
-        if t is None:
-            return False
-        return t <= self.sla_limit_hours()
+        return self._meets_sla
 
     def excess_hours(self) -> float:
         """Horas de exceso sobre el SLA (0 si cumple)."""
-        t = self.resolution_time_hours()
-        if t is None:
-            return 0.0
-        return max(0.0, t - self.sla_limit_hours())
+        return self._excess_h
 
     def penalty_usd(self) -> float:
         """Penalización en USD por incumplimiento SLA."""
-        return round(self.excess_hours() * self.PENALTY_USD_PER_HOUR[self.severity], 2)
+        return self._penalty_usd
 
     def to_dict(self) -> dict:
         """Serializa el incidente a diccionario."""
+        t = self._resolution_h
+        if self._created_iso is None:
+            self._created_iso = self._created_at.isoformat()
         return {
             "incident_id":      self.incident_id,
             "service_name":     self.service_name,
-            "severity":         self.severity.name,
+            "severity":         self._severity_str,
             "incident_type":    self.incident_type,
             "team":             self.team,
             "clients_affected": self.clients_affected,
-            "status":           self.status.value,
-            "created_at":       self.created_at.isoformat(),
+            "status":           self._status_str,
+            "created_at":       self._created_iso,
             "resolved_at":      self.resolved_at.isoformat() if self.resolved_at else None,
-            "resolution_time_h": round(self.resolution_time_hours(), 4) if self.resolution_time_hours() else None,
-            "sla_limit_h":      self.sla_limit_hours(),
-            "meets_sla":        self.meets_sla(),
-            "excess_h":         round(self.excess_hours(), 4),
-            "penalty_usd":      self.penalty_usd(),
+            "resolution_time_h": round(t, 4) if t else None,
+            "sla_limit_h":      self._sla_limit,
+            "meets_sla":        self._meets_sla,
+            "excess_h":         round(self._excess_h, 4),
+            "penalty_usd":      round(self._penalty_usd, 2),
         }
 
     def __repr__(self):
-        return (f"<Incident {self.incident_id} | {self.severity.name} | "
-                f"{self.status.value} | SLA: {'✓' if self.meets_sla() else '✗'}>")
+        return (f"<Incident {self.incident_id} | {self._severity_str} | "
+                f"{self._status_str} | SLA: {'✓' if self._meets_sla else '✗'}>")
+
+
+def _severity_table(values: dict) -> np.ndarray:
+    """Tabla float64 indexada por Severity.value (la posición 0 no se usa y queda en NaN)."""
+    table = np.full(max(s.value for s in Severity) + 1, np.nan)
+    for sev, v in values.items():
+        table[sev.value] = v
+    return table
+
+
+# Tablas paralelas para evaluación vectorizada: SLA_LIMITS[sev_ids] resuelve N incidentes a la vez
+SLA_LIMITS    = _severity_table(Incident.SLA_HOURS)
+PENALTY_RATES = _severity_table(Incident.PENALTY_USD_PER_HOUR)
@@ -3,6 +3,7 @@ CloudCore SaaS — domain/risk.py
 COBIT 2019 / ISO 31000: Entidad de dominio para Riesgo Operativo
 """
 from enum import Enum
+import numpy as np
 
 
 class RiskLevel(Enum):
@@ -21,6 +22,11 @@ class Risk:
     # Apetito de riesgo organizacional de CloudCore SaaS
     RISK_APPETITE_USD = 50_000  # Máximo riesgo residual anual tolerable
 
+    __slots__ = (
+        "risk_id", "name", "category", "probability", "impact_usd",
+        "controls",
+    )
+
     def __init__(self, risk_id: str, name: str, category: str,
                  probability: float, impact_usd: float):
         """
@@ -33,11 +39,11 @@ class Risk:
         self.category    = category
         self.probability = probability
         self.impact_usd  = impact_usd
-        self.controls    = []   # Controles mitigantes aplicados
+        self.controls: list[dict] = []   # Controles mitigantes aplicados
 
     def inherent_risk_usd(self) -> float:
         """Riesgo inherente = Probabilidad × Impacto (sin controles)."""
-        return round(self.probability * self.impact_usd, 2)
+        return self.probability * self.impact_usd
 
     def add_control(self, control_name: str, effectiveness: float):
         """
@@ -54,15 +60,15 @@ class Risk:
         if not self.controls:
             return 0.0
         # Efectividad combinada (no acumulativa simple)
-        remaining = 1.0
-        for c in self.controls:
-            remaining *= (1 - c["effectiveness"])
-        return round(1 - remaining, 4)
+        eff = np.fromiter((c["effectiveness"] for c in self.controls),
+                          dtype=np.float64, count=len(self.controls))
+        remaining = np.prod(1 - eff)
+        return float(1 - remaining)
 
     def residual_risk_usd(self) -> float:
         """Riesgo residual = Riesgo inherente × (1 - efectividad controles)."""
         reduction = self.control_effectiveness()
-        return round(self.inherent_risk_usd() * (1 - reduction), 2)
+        return self.inherent_risk_usd() * (1 - reduction)
 
     def risk_level(self) -> RiskLevel:
         """Clasifica el nivel de riesgo residual."""
@@ -86,10 +92,10 @@ class Risk:
             "category":         self.category,
             "probability":      self.probability,
             "impact_usd":       self.impact_usd,
-            "inherent_risk_usd": self.inherent_risk_usd(),
+            "inherent_risk_usd": round(self.inherent_risk_usd(), 2),
             "controls":         self.controls,
-            "control_effectiveness": self.control_effectiveness(),
-            "residual_risk_usd": self.residual_risk_usd(),
+            "control_effectiveness": round(self.control_effectiveness(), 4),
+            "residual_risk_usd": round(self.residual_risk_usd(), 2),
             "risk_level":       self.risk_level().value,
             "exceeds_appetite": self.exceeds_appetite(),
         }
@@ -98,3 +104,13 @@ class Risk:
         return (f"<Risk {self.risk_id} | {self.name} | "
                 f"Residual: USD {self.residual_risk_usd():,.0f} | "
                 f"{self.risk_level().value}>")
+
+
+def bulk_residuals(risks: list[Risk]) -> np.ndarray:
+    """
+    Riesgo residual de un lote de riesgos, vectorizado.
+    Equivale a [r.residual_risk_usd() for r in risks].
+    """
+    inherent = np.array([r.inherent_risk_usd() for r in risks], dtype=np.float64)
+    eff      = np.array([r.control_effectiveness() for r in risks], dtype=np.float64)
+    return inherent * (1 - eff)
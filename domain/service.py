@@ -21,6 +21,11 @@ class Service:
 
     COST_PER_HOUR_USD = 15000  # Costo de indisponibilidad por hora
 
+    __slots__ = (
+        "service_id", "name", "tier", "sla_availability_pct", "status", "downtime_events",
+        "_durations", "_costs", "_status_str",
+    )
+
     def __init__(self, service_id: str, name: str, tier: int,
                  sla_availability_pct: float = 99.9):
         self.service_id           = service_id
@@ -28,29 +33,36 @@ class Service:
         self.tier                 = tier          # 1=Crítico, 2=Importante, 3=Estándar
         self.sla_availability_pct = sla_availability_pct
         self.status               = ServiceStatus.OPERATIONAL
+        self._status_str          = self.status.value   # se actualiza en set_status()
         self.downtime_events      = []            # Lista de eventos de inactividad
+        # Duraciones y costos en paralelo a downtime_events, para totalizar sin recorrer dicts
+        self._durations: list[float] = []
+        self._costs: list[float]     = []
 
     def register_downtime(self, start: datetime, end: datetime, cause: str = ""):
         """Registra un evento de inactividad del servicio."""
         duration_h = (end - start).total_seconds() / 3600
-        self.downtime_events.append({
+        event = {
             "start":       start.isoformat(),
             "end":         end.isoformat(),
             "duration_h":  round(duration_h, 4),
             "cause":       cause,
             "cost_usd":    round(duration_h * self.COST_PER_HOUR_USD, 2),
-        })
+        }
+        self.downtime_events.append(event)
+        self._durations.append(duration_h)
+        self._costs.append(duration_h * self.COST_PER_HOUR_USD)
 
     def total_downtime_hours(self) -> float:
         """Total de horas de inactividad registradas."""
-        return sum(e["duration_h"] for e in self.downtime_events)
+        return sum(self._durations)
 
     def availability(self, total_hours: float) -> float:
         """Calcula el porcentaje de disponibilidad para el período dado."""
         if total_hours == 0:
             return 100.0
         uptime = total_hours - self.total_downtime_hours()
-        return round((uptime / total_hours) * 100, 4)
+        return (uptime / total_hours) * 100
 
     def meets_sla(self, total_hours: float) -> bool:
         """Determina si el servicio cumple el SLA de disponibilidad."""
@@ -58,10 +70,11 @@ class Service:
 
     def total_financial_impact(self) -> float:
         """Impacto financiero total acumulado por inactividad."""
-        return round(sum(e["cost_usd"] for e in self.downtime_events), 2)
+        return sum(self._costs)
 
     def set_status(self, status: ServiceStatus):
         self.status = status
+        self._status_str = status.value
 
     def to_dict(self) -> dict:
         return {
@@ -69,11 +82,11 @@ class Service:
             "name":                 self.name,
             "tier":                 self.tier,
             "sla_availability_pct": self.sla_availability_pct,
-            "status":               self.status.value,
+            "status":               self._status_str,
             "total_downtime_h":     round(self.total_downtime_hours(), 4),
-            "total_cost_usd":       self.total_financial_impact(),
+            "total_cost_usd":       round(self.total_financial_impact(), 2),
             "downtime_events":      self.downtime_events,
         }
 
     def __repr__(self):
-        return f"<Service {self.service_id} | {self.name} | Tier {self.tier} | {self.status.value}>"
+        return f"<Service {self.service_id} | {self.name} | Tier {self.tier} | {self._status_str}>"
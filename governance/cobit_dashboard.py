@@ -24,7 +24,7 @@ class GovernanceDashboard:
     def add_kpi(self, kpi: KPI):
         """Agrega un KPI al dashboard."""
         self.kpis.append(kpi)
-        logger.info(f"[COBIT KPI] {kpi.name}: {kpi.value}{kpi.unit} | {kpi.status()}")
+        logger.info("[COBIT KPI] %s: %s%s | %s", kpi.name, kpi.value, kpi.unit, kpi.status())
 
     def summary(self):
         """Imprime el resumen ejecutivo del dashboard (compatible con código base)."""
@@ -32,30 +32,39 @@ class GovernanceDashboard:
         print(f"  DASHBOARD COBIT 2019 — CloudCore SaaS | {self.period}")
         print(f"{'='*55}")
         for kpi in self.kpis:
-            icon = "✓" if kpi.status() == "OK" else "✗"
-            print(f"  {icon} {kpi.name:<35} {kpi.value:>7.2f}{kpi.unit}  [{kpi.status()}]")
+            status = kpi.status()
+            icon = "✓" if status == "OK" else "✗"
+            print(f"  {icon} {kpi.name:<35} {kpi.value:>7.2f}{kpi.unit}  [{status}]")
         print(f"{'='*55}")
-        level, desc = self.maturity_level()
+        classified  = self._classify()
+        level, desc = self.maturity_level(classified)
         print(f"  Nivel de Madurez: {level}/5 — {desc}")
-        print(f"  Estado Gobernanza: {self.governance_status()}")
+        print(f"  Estado Gobernanza: {self.governance_status(classified)}")
         print(f"{'='*55}\n")
 
-    def alerts(self) -> list[KPI]:
+    def _classify(self) -> tuple[list[KPI], list[KPI]]:
+        """Separa los KPIs en (OK, ALERTA)."""
+        ok, alert = [], []
+        for k in self.kpis:
+            (ok if k.status() == "OK" else alert).append(k)
+        return ok, alert
+
+    def alerts(self, classified: tuple[list[KPI], list[KPI]] = None) -> list[KPI]:
         """Retorna KPIs en estado ALERTA."""
-        return [k for k in self.kpis if k.status() == "ALERTA"]
+        return (classified or self._classify())[1]
 
-    def governance_status(self) -> str:
+    def governance_status(self, classified: tuple[list[KPI], list[KPI]] = None) -> str:
         """Determina el estado general de gobernanza."""
-        n_alerts = len(self.alerts())
+        n_alerts = len(self.alerts(classified))
         if n_alerts == 0:
             return "CONFORME"
         elif n_alerts <= self.MAX_ALERTS_TOLERATED:
             return "OBSERVACIÓN"
         return "NO CONFORME"
 
-    def maturity_level(self) -> tuple[int, str]:
+    def maturity_level(self, classified: tuple[list[KPI], list[KPI]] = None) -> tuple[int, str]:
         """Calcula el nivel de madurez COBIT basado en KPIs en OK."""
-        ok_count = sum(1 for k in self.kpis if k.status() == "OK")
+        ok_count = len((classified or self._classify())[0])
         total    = len(self.kpis) or 1
         score    = round((ok_count / total) * 5)
         descriptions = {
@@ -68,10 +77,10 @@ class GovernanceDashboard:
         }
         return score, descriptions.get(score, "Inicial")
 
-    def committee_decision(self) -> list[str]:
+    def committee_decision(self, classified: tuple[list[KPI], list[KPI]] = None) -> list[str]:
         """Genera decisiones del comité de gobierno TI basadas en KPIs."""
         decisions = []
-        for kpi in self.alerts():
+        for kpi in self.alerts(classified):
             decisions.append(
                 f"ACCIÓN REQUERIDA: '{kpi.name}' en ALERTA "
                 f"(valor {kpi.value:.2f} vs umbral {kpi.threshold:.2f}). "
@@ -82,13 +91,14 @@ class GovernanceDashboard:
         return decisions
 
     def to_dict(self) -> dict:
-        level, desc = self.maturity_level()
+        classified  = self._classify()
+        level, desc = self.maturity_level(classified)
         return {
             "period":           self.period,
             "kpis":             [k.to_dict() for k in self.kpis],
-            "alerts_count":     len(self.alerts()),
-            "governance_status": self.governance_status(),
+            "alerts_count":     len(classified[1]),
+            "governance_status": self.governance_status(classified),
             "maturity_level":   level,
             "maturity_desc":    desc,
-            "committee_decisions": self.committee_decision(),
+            "committee_decisions": self.committee_decision(classified),
         }
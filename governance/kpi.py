@@ -13,32 +13,70 @@ class KPI:
     Alineado con la cascada de metas de COBIT 2019 (ISACA, 2019).
     """
 
+    __slots__ = (
+        "name", "_value", "_threshold", "unit", "framework", "_higher_is_better",
+        "_status", "_gap", "_gap_pct",
+    )
+
     def __init__(self, name: str, value: float, threshold: float,
                  unit: str = "%", framework: str = "COBIT 2019",
                  higher_is_better: bool = True):
-        self.name             = name
-        self.value            = value
-        self.threshold        = threshold
-        self.unit             = unit
-        self.framework        = framework
-        self.higher_is_better = higher_is_better
+        self.name              = name
+        self._value            = value
+        self._threshold        = threshold
+        self.unit              = unit
+        self.framework         = framework
+        self._higher_is_better = higher_is_better
+        self._evaluate()
+
+    def _evaluate(self):
+        """Recalcula estado y brechas a partir de value, threshold y higher_is_better."""
+        value, threshold = self._value, self._threshold
+        if self._higher_is_better:
+            self._status = "OK" if value >= threshold else "ALERTA"
+        else:
+            self._status = "OK" if value <= threshold else "ALERTA"
+        self._gap     = value - threshold
+        self._gap_pct = 0.0 if threshold == 0 else (self._gap / threshold) * 100
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        self._value = value
+        self._evaluate()
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value: float):
+        self._threshold = value
+        self._evaluate()
+
+    @property
+    def higher_is_better(self) -> bool:
+        return self._higher_is_better
+
+    @higher_is_better.setter
+    def higher_is_better(self, value: bool):
+        self._higher_is_better = value
+        self._evaluate()
 
     def status(self) -> str:
         """Retorna el estado del KPI respecto al umbral."""
-        if self.higher_is_better:
-            return "OK" if self.value >= self.threshold else "ALERTA"
-        else:
-            return "OK" if self.value <= self.threshold else "ALERTA"
+        return self._status
 
     def gap(self) -> float:
         """Brecha entre el valor actual y el umbral objetivo."""
-        return round(self.value - self.threshold, 4)
+        return self._gap
 
     def gap_pct(self) -> float:
         """Brecha como porcentaje del umbral."""
-        if self.threshold == 0:
-            return 0.0
-        return round((self.gap() / self.threshold) * 100, 2)
+        return self._gap_pct
 
     def to_dict(self) -> dict:
         return {
@@ -47,8 +85,8 @@ class KPI:
             "threshold": self.threshold,
             "unit":      self.unit,
             "framework": self.framework,
-            "status":    self.status(),
-            "gap":       self.gap(),
+            "status":    self._status,
+            "gap":       round(self._gap, 4),
         }
 
     def __repr__(self):
@@ -5,31 +5,56 @@ Tarea Semana 5 — Maestría en Gestión de Tecnologías de la Información
 Universidad Mariano Gálvez de Guatemala
 Curso: Planeación para la Continuidad del Negocio
 """
+import gzip
 import logging
-import os
-import random
+import queue
 import time
 import numpy as np
 from datetime import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from pathlib import Path
 
 # ── Configuración de logging estructurado ────────────────────────────────────
-LOG_DIR = os.path.join(os.path.expanduser("~"), "cloudcore_saas", "outputs", "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
-
+LOG_DIR = Path.home() / "cloudcore_saas" / "outputs" / "logs"
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class _GzipFileHandler(logging.FileHandler):
+    """FileHandler que escribe en un archivo gzip sin forzar flush por registro."""
+
+    def _open(self):
+        return gzip.open(self.baseFilename, self.mode + "t", encoding=self.encoding)
+
+    def emit(self, record):
+        # El flush por registro de StreamHandler cortaría cada bloque comprimido;
+        # el MemoryHandler que envuelve a este handler ya agrupa las escrituras.
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+# Los registros se formatean en el hilo productor (QueueHandler) y la escritura a
+# archivo/consola ocurre en el hilo del QueueListener, fuera del camino crítico.
+# El archivo se escribe comprimido y en lotes (cada 512 registros o ante un WARNING).
+_log_file     = _GzipFileHandler(LOG_DIR / "cloudcore_main.log.gz", encoding="utf-8")
+_log_buffer   = MemoryHandler(capacity=512, flushLevel=logging.WARNING, target=_log_file)
+_log_queue    = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _log_buffer, logging.StreamHandler())
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
-    handlers=[
-        logging.FileHandler(f"{LOG_DIR}/cloudcore_main.log", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
+    format="%(asctime)s [%(levelname)s] [%(threadName)s] %(name)s — %(message)s",
+    handlers=[QueueHandler(_log_queue)],
 )
+_log_listener.start()
 logger = logging.getLogger("CloudCore.Main")
 
 # ── Imports del proyecto ─────────────────────────────────────────────────────
 from domain.incident           import Incident, Severity
 from domain.service            import Service, ServiceStatus
-from domain.risk               import Risk
+from domain.risk               import Risk, bulk_residuals
 from domain.continuity         import ContinuityScenario, DisruptionType
 from management.incident_manager    import IncidentManager
 from management.sla_manager         import SLAManager
@@ -41,8 +66,8 @@ from reports.report_generator  import ReportGenerator
 
 
 def main():
-    random.seed(42)
-    np.random.seed(42)
+    # Un único generador PCG64 alimenta toda la simulación
+    rng = np.random.default_rng(42)
 
     logger.info("=" * 60)
     logger.info("CloudCore SaaS — Sistema Integrado de Gestión TI")
@@ -63,26 +88,31 @@ def main():
     print("Demo SLA:", sla_demo.evaluate(incident_demo))
 
     # Simulación de 15 incidentes (cumple requisito ≥ 10)
-    manager = IncidentManager(seed=42)
+    manager = IncidentManager(rng=rng)
     incidents = manager.simulate_incidents(count=15)
 
     sla_mgr = SLAManager()
     sla_summary = sla_mgr.evaluate_batch(incidents)
     breakdown   = sla_mgr.compliance_by_severity(incidents)
 
-    print(f"\n{'─'*55}")
-    print("  ITIL 4 — Resultados de Gestión de Incidentes")
-    print(f"{'─'*55}")
-    print(f"  Total incidentes:     {sla_summary['total_incidents']}")
-    print(f"  Cumplen SLA:          {sla_summary['compliant']}")
-    print(f"  Tasa cumplimiento:    {sla_summary['compliance_rate_pct']:.2f}%")
-    print(f"  Penalización total:   USD {sla_summary['total_penalty_usd']:,.2f}")
-    print(f"  Estado SLA global:    {sla_summary['sla_status']}")
-    print(f"{'─'*55}")
-    print("  Desglose por severidad:")
-    for sev, data in breakdown.items():
-        print(f"    {sev}: {data['compliant']}/{data['total']} cumplen "
-              f"({data['pct']:.1f}%) | Penalización: USD {data['penalty_usd']:,.2f}")
+    lines = [
+        f"\n{'─'*55}",
+        "  ITIL 4 — Resultados de Gestión de Incidentes",
+        f"{'─'*55}",
+        f"  Total incidentes:     {sla_summary['total_incidents']}",
+        f"  Cumplen SLA:          {sla_summary['compliant']}",
+        f"  Tasa cumplimiento:    {sla_summary['compliance_rate_pct']:.2f}%",
+        f"  Penalización total:   USD {sla_summary['total_penalty_usd']:,.2f}",
+        f"  Estado SLA global:    {sla_summary['sla_status']}",
+        f"{'─'*55}",
+        "  Desglose por severidad:",
+    ]
+    lines.extend(
+        f"    {sev}: {data['compliant']}/{data['total']} cumplen "
+        f"({data['pct']:.1f}%) | Penalización: USD {data['penalty_usd']:,.2f}"
+        for sev, data in breakdown.items()
+    )
+    print("\n".join(lines))
 
     reporter = ReportGenerator()
     reporter.save_structured_log("ITIL4_Incidentes", {
@@ -107,29 +137,26 @@ def main():
     MESES     = ["Ene","Feb","Mar","Abr","May","Jun",
                  "Jul","Ago","Sep","Oct","Nov","Dic"]
     # Datos simulados con meses críticos en Mar, Ago, Nov
-    uptimes = np.random.uniform(99.85, 99.99, 12)
-    uptimes[2]  = 99.38  # Marzo
-    uptimes[4]  = 99.87
-    uptimes[5]  = 99.87
-    uptimes[6]  = 99.86
-    uptimes[7]  = 99.54  # Agosto
-    uptimes[10] = 98.52  # Noviembre
-
-    HOURS_MONTH = 730
-    for i, mes in enumerate(MESES):
-        hours_down = HOURS_MONTH * (1 - uptimes[i] / 100)
-        avail_mgr.record_monthly_availability(mes, uptimes[i], hours_down)
+    uptimes = rng.uniform(99.85, 99.99, 12)
+    #                        Mar    May    Jun    Jul    Ago    Nov
+    override_idx = np.array([2,     4,     5,     6,     7,     10])
+    override_val = np.array([99.38, 99.87, 99.87, 99.86, 99.54, 98.52])
+    uptimes[override_idx] = override_val
+
+    avail_mgr.record_monthly_batch(MESES, uptimes)
 
     availability_summary = avail_mgr.annual_summary()
 
-    print(f"\n{'─'*55}")
-    print("  ISO/IEC 20000 — Disponibilidad Anual")
-    print(f"{'─'*55}")
-    print(f"  Uptime anual promedio: {availability_summary['avg_annual_uptime_pct']:.4f}%")
-    print(f"  Meses que cumplen:     {availability_summary['months_compliant']}/12")
-    print(f"  Meses críticos:        {availability_summary['non_compliant_months']}")
-    print(f"  Impacto financiero:    USD {availability_summary['total_financial_impact']:,.2f}")
-    print(f"  Estado global:         {availability_summary['global_status']}")
+    print("\n".join([
+        f"\n{'─'*55}",
+        "  ISO/IEC 20000 — Disponibilidad Anual",
+        f"{'─'*55}",
+        f"  Uptime anual promedio: {availability_summary['avg_annual_uptime_pct']:.4f}%",
+        f"  Meses que cumplen:     {availability_summary['months_compliant']}/12",
+        f"  Meses críticos:        {availability_summary['non_compliant_months']}",
+        f"  Impacto financiero:    USD {availability_summary['total_financial_impact']:,.2f}",
+        f"  Estado global:         {availability_summary['global_status']}",
+    ]))
 
     reporter.save_structured_log("ISO20000_Disponibilidad", availability_summary)
 
@@ -161,18 +188,21 @@ def main():
     risks[2].add_control("Réplica activo-activo",   effectiveness=0.60)
     risks[3].add_control("Auditoría trimestral",    effectiveness=0.30)
 
-    print(f"\n{'─'*55}")
-    print("  Riesgo Operativo — Apetito de Riesgo: USD 50,000")
-    print(f"{'─'*55}")
-    total_residual = 0
-    for r in risks:
-        flag = "⚠ EXCEDE APETITO" if r.exceeds_appetite() else "✓ Dentro del apetito"
-        print(f"  {r.risk_id} | {r.name}")
-        print(f"    Inherente: USD {r.inherent_risk_usd():>10,.2f} | "
-              f"Residual: USD {r.residual_risk_usd():>10,.2f} | {flag}")
-        total_residual += r.residual_risk_usd()
-    print(f"{'─'*55}")
-    print(f"  Riesgo residual total: USD {total_residual:,.2f}")
+    lines = [
+        f"\n{'─'*55}",
+        "  Riesgo Operativo — Apetito de Riesgo: USD 50,000",
+        f"{'─'*55}",
+    ]
+    residuals = bulk_residuals(risks)
+    for r, residual in zip(risks, residuals):
+        flag = "⚠ EXCEDE APETITO" if residual > Risk.RISK_APPETITE_USD else "✓ Dentro del apetito"
+        lines.append(f"  {r.risk_id} | {r.name}")
+        lines.append(f"    Inherente: USD {r.inherent_risk_usd():>10,.2f} | "
+                     f"Residual: USD {residual:>10,.2f} | {flag}")
+    total_residual = float(residuals.sum())
+    lines.append(f"{'─'*55}")
+    lines.append(f"  Riesgo residual total: USD {total_residual:,.2f}")
+    print("\n".join(lines))
 
     dashboard_data = dashboard.to_dict()
     reporter.save_structured_log("COBIT2019_Gobernanza", dashboard_data)
@@ -187,26 +217,31 @@ def main():
     print(f"\nDemo Recuperación (45 min): {recovery_demo.simulate_recovery(45)}")
     print(f"Demo Recuperación (90 min): {recovery_demo.simulate_recovery(90)}")
 
-    simulator = RecoverySimulator(rto_hours=4.0)
-    for scenario in RecoverySimulator.default_scenarios(seed=42):
+    simulator = RecoverySimulator(rto_hours=4.0, rng=rng)
+    for scenario in RecoverySimulator.default_scenarios(rng=rng):
         simulator.add_scenario(scenario)
 
     results  = simulator.run_all()
     cont_sum = simulator.continuity_summary()
 
-    print(f"\n{'─'*55}")
-    print("  ISO 22301 — Análisis de Continuidad")
-    print(f"{'─'*55}")
+    lines = [
+        f"\n{'─'*55}",
+        "  ISO 22301 — Análisis de Continuidad",
+        f"{'─'*55}",
+    ]
     for r in results:
         rto_s = "✓" if r["meets_rto"] else "✗"
         rpo_s = "✓" if r["meets_rpo"] else "✗"
-        print(f"  {r['scenario_id']} | {r['disruption_type']}")
-        print(f"    RTO: {r['actual_rto_h']:.2f}h {rto_s} | RPO: {r['actual_rpo_h']:.2f}h {rpo_s} | "
-              f"Impacto: USD {r['financial_impact_usd']:,.2f}")
-    print(f"{'─'*55}")
-    print(f"  RTO cumplimiento: {cont_sum['rto_compliance_pct']:.1f}%")
-    print(f"  Escenarios críticos: {cont_sum['critical_scenarios']}")
-    print(f"  Impacto total: USD {cont_sum['total_financial_impact_usd']:,.2f}")
+        lines.append(f"  {r['scenario_id']} | {r['disruption_type']}")
+        lines.append(f"    RTO: {r['actual_rto_h']:.2f}h {rto_s} | RPO: {r['actual_rpo_h']:.2f}h {rpo_s} | "
+                     f"Impacto: USD {r['financial_impact_usd']:,.2f}")
+    lines += [
+        f"{'─'*55}",
+        f"  RTO cumplimiento: {cont_sum['rto_compliance_pct']:.1f}%",
+        f"  Escenarios críticos: {cont_sum['critical_scenarios']}",
+        f"  Impacto total: USD {cont_sum['total_financial_impact_usd']:,.2f}",
+    ]
+    print("\n".join(lines))
 
     reporter.save_structured_log("ISO22301_Continuidad", cont_sum)
 
@@ -221,6 +256,7 @@ def main():
         dashboard_data       = dashboard_data,
         continuity_summary   = cont_sum,
     )
+    reporter.close()
 
     logger.info("=" * 60)
     logger.info("✅ Simulación completada. Todos los módulos ejecutados.")
@@ -229,4 +265,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        _log_listener.stop()
+        _log_buffer.close()   # vuelca los registros pendientes al archivo
+        _log_file.close()
@@ -0,0 +1,55 @@
+"""
+CloudCore SaaS — management/_sla_kernels.py
+ITIL 4: Kernels numéricos para la evaluación SLA por lotes
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba es opcional: sin él se usa la versión NumPy
+    njit = None
+
+# Por debajo de este tamaño de lote, compilar el kernel no compensa
+_JIT_MIN_INCIDENTS = 1_000
+
+
+def _sla_numpy(res_h, sla_h, penalty_rate):
+    """Cumplimiento y penalización por incidente con operaciones NumPy."""
+    meets   = res_h <= sla_h
+    # Incidentes sin resolver (NaN) no cumplen pero tampoco generan penalización
+    penalty = np.where(meets | np.isnan(res_h), 0.0, (res_h - sla_h) * penalty_rate)
+    return meets, penalty
+
+
+if njit is not None:
+    # Sin fastmath: sus supuestos (no-NaN) eliminarían la comprobación de incidentes abiertos
+    @njit(cache=True)
+    def _sla_jit(res_h, sla_h, penalty_rate):
+        n       = res_h.shape[0]
+        meets   = np.empty(n, np.bool_)
+        penalty = np.empty(n, np.float64)
+        for i in range(n):
+            m = res_h[i] <= sla_h[i]
+            meets[i] = m
+            if m or np.isnan(res_h[i]):
+                penalty[i] = 0.0
+            else:
+                penalty[i] = (res_h[i] - sla_h[i]) * penalty_rate[i]
+        return meets, penalty
+
+
+def sla_kernel(res_h: np.ndarray, sla_h: np.ndarray,
+               penalty_rate: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evalúa un lote de incidentes a partir de arreglos paralelos.
+
+    Args:
+        res_h:        Tiempo de resolución en horas (NaN si no está resuelto)
+        sla_h:        SLA máximo de resolución en horas
+        penalty_rate: Penalización USD por hora de exceso
+    Returns:
+        (meets, penalty): arreglos bool y float64 de la misma longitud
+    """
+    if njit is None or res_h.shape[0] < _JIT_MIN_INCIDENTS:
+        return _sla_numpy(res_h, sla_h, penalty_rate)
+    return _sla_jit(res_h, sla_h, penalty_rate)
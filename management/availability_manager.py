@@ -4,6 +4,7 @@ ISO/IEC 20000:2018: Gestor de Disponibilidad del Servicio
 """
 import logging
 from datetime import datetime
+import numpy as np
 from domain.service import Service
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,11 @@ class AvailabilityManager:
         self.downtime_minutes = 0
         self.services: list[Service] = []
         self.monthly_records: list[dict] = []
+        # Columnas paralelas (SoA) de los registros mensuales, para el resumen vectorizado
+        self._months: list[str]       = []
+        self._uptime: list[float]     = []
+        self._cost: list[float]       = []
+        self._meets: list[bool]       = []
 
     def register_downtime(self, minutes: float):
         """Registra downtime directo en minutos (compatible con código base)."""
@@ -44,16 +50,40 @@ class AvailabilityManager:
     def record_monthly_availability(self, month: str, uptime_pct: float,
                                     hours_down: float, sla_target: float = 99.9):
         """Registra disponibilidad mensual para análisis anual."""
-        cost = round(hours_down * Service.COST_PER_HOUR_USD, 2)
+        cost = hours_down * Service.COST_PER_HOUR_USD
+        return self._append_month(month, uptime_pct, hours_down, cost, uptime_pct >= sla_target)
+
+    def record_monthly_batch(self, months: list[str], uptimes: np.ndarray,
+                             sla_target: float = 99.9) -> list[dict]:
+        """
+        Registra varios meses a partir de sus uptimes (%); horas caídas, costo y
+        cumplimiento se calculan de forma vectorizada para todo el lote.
+        """
+        uptimes    = np.asarray(uptimes, dtype=np.float64)
+        hours_down = self.HOURS_PER_MONTH * (1 - uptimes / 100)
+        costs      = hours_down * Service.COST_PER_HOUR_USD
+        meets      = uptimes >= sla_target
+        return [
+            self._append_month(m, up, hd, c, ok)
+            for m, up, hd, c, ok in zip(months, uptimes.tolist(), hours_down.tolist(),
+                                        costs.tolist(), meets.tolist())
+        ]
+
+    def _append_month(self, month: str, uptime_pct: float, hours_down: float,
+                      cost: float, meets: bool) -> dict:
         record = {
             "month":           month,
             "uptime_pct":      round(uptime_pct, 4),
             "hours_down":      round(hours_down, 2),
             "minutes_down":    round(hours_down * 60, 1),
-            "meets_sla":       uptime_pct >= sla_target,
-            "financial_impact": cost,
+            "meets_sla":       meets,
+            "financial_impact": round(cost, 2),
         }
         self.monthly_records.append(record)
+        self._months.append(month)
+        self._uptime.append(uptime_pct)
+        self._cost.append(cost)
+        self._meets.append(meets)
         status = "✓" if record["meets_sla"] else "✗"
         logger.info(
             f"[AVAILABILITY] {month} | {uptime_pct:.4f}% | "
@@ -65,15 +95,17 @@ class AvailabilityManager:
         """Genera resumen anual de disponibilidad."""
         if not self.monthly_records:
             return {}
-        avg_uptime = sum(r["uptime_pct"] for r in self.monthly_records) / len(self.monthly_records)
-        compliant  = [r for r in self.monthly_records if r["meets_sla"]]
-        total_cost = sum(r["financial_impact"] for r in self.monthly_records)
+        uptime     = np.asarray(self._uptime)
+        meets      = np.asarray(self._meets)
+        avg_uptime = float(uptime.mean())
+        compliant  = int(meets.sum())
+        total_cost = float(np.sum(self._cost))
 
         summary = {
             "avg_annual_uptime_pct":  round(avg_uptime, 4),
-            "months_compliant":       len(compliant),
-            "months_non_compliant":   len(self.monthly_records) - len(compliant),
-            "non_compliant_months":   [r["month"] for r in self.monthly_records if not r["meets_sla"]],
+            "months_compliant":       compliant,
+            "months_non_compliant":   len(self._months) - compliant,
+            "non_compliant_months":   [m for m, ok in zip(self._months, self._meets) if not ok],
             "total_financial_impact": round(total_cost, 2),
             "global_status":          "CUMPLE" if avg_uptime >= sla_target else "REQUIERE_MEJORA",
         }
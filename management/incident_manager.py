@@ -2,10 +2,10 @@
 CloudCore SaaS — management/incident_manager.py
 ITIL 4: Gestor del ciclo de vida de incidentes
 """
-import random
 import logging
 from datetime import datetime, timedelta
-from domain.incident import Incident, Severity
+import numpy as np
+from domain.incident import Incident, Severity, SLA_LIMITS
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +31,13 @@ class IncidentManager:
     Implementa las prácticas de Incident Management de ITIL 4 (AXELOS, 2019).
     """
 
-    def __init__(self, seed: int = 42):
-        random.seed(seed)
+    def __init__(self, seed: int = 42, rng: np.random.Generator | None = None):
+        """
+        Args:
+            seed: Semilla del generador propio (se ignora si se inyecta rng)
+            rng:  Generador compartido con el resto de la simulación
+        """
+        self._rng = rng if rng is not None else np.random.default_rng(seed)
         self.incidents: list[Incident] = []
         self._counter = 1
 
@@ -43,15 +48,16 @@ class IncidentManager:
 
     def register_incident(self, service_name: str, severity: Severity,
                           incident_type: str = None, team: str = None,
-                          clients_affected: int = 0) -> Incident:
+                          clients_affected: int = 0, created_at: datetime = None) -> Incident:
         """Registra un nuevo incidente en el sistema."""
         inc = Incident(
             incident_id=self._next_id(),
             service_name=service_name,
             severity=severity,
-            incident_type=incident_type or random.choice(INCIDENT_TYPES),
-            team=team or random.choice(TEAMS),
+            incident_type=incident_type or INCIDENT_TYPES[self._rng.integers(len(INCIDENT_TYPES))],
+            team=team or TEAMS[self._rng.integers(len(TEAMS))],
             clients_affected=clients_affected,
+            created_at=created_at,
         )
         self.incidents.append(inc)
         logger.info(f"[INCIDENT REGISTERED] {inc.incident_id} | {inc.severity.name} | {inc.incident_type}")
@@ -61,32 +67,38 @@ class IncidentManager:
         """
         Simula un lote de incidentes con resolución automática.
         Garantiza al menos 10 incidentes con variación realista.
+        Todas las variables aleatorias se extraen en lote (una llamada por distribución).
         """
         severities   = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
         weights      = [0.10, 0.25, 0.35, 0.30]
         base_time    = datetime(2024, 1, 1, 8, 0, 0)
-
-        for _ in range(count):
-            sev  = random.choices(severities, weights=weights)[0]
-            inc  = self.register_incident(
+        rng          = self._rng
+
+        sev_idx  = rng.choice(len(severities), size=count, p=weights)
+        clients  = np.where(sev_idx == 0,                      # CRITICAL
+                            rng.integers(50, 3001, count),
+                            rng.integers(1, 501, count))
+        offsets  = rng.integers(1, 701, count)
+        # 30% de incidentes exceden el SLA (escenario realista)
+        breach   = rng.random(count) < 0.30
+        factors  = np.where(breach, rng.uniform(1.1, 3.0, count), rng.uniform(0.3, 0.95, count))
+        types    = rng.integers(0, len(INCIDENT_TYPES), count)
+        teams    = rng.integers(0, len(TEAMS), count)
+        sev_ids  = np.array([s.value for s in severities])[sev_idx]
+        sla_h    = SLA_LIMITS[sev_ids]
+        resolution_h = sla_h * factors
+
+        for i in range(count):
+            created = base_time + timedelta(hours=int(offsets[i]))
+            inc = self.register_incident(
                 service_name="CloudCore Facturación SaaS",
-                severity=sev,
-                clients_affected=random.randint(50, 3000) if sev == Severity.CRITICAL
-                                 else random.randint(1, 500),
+                severity=severities[sev_idx[i]],
+                incident_type=INCIDENT_TYPES[types[i]],
+                team=TEAMS[teams[i]],
+                clients_affected=int(clients[i]),
+                created_at=created,
             )
-            # Ajustar tiempos de creación y resolución
-            offset_h = random.randint(1, 700)
-            inc.created_at = base_time + timedelta(hours=offset_h)
-
-            sla_h = inc.sla_limit_hours()
-            # 30% de incidentes exceden el SLA (escenario realista)
-            if random.random() < 0.30:
-                factor = random.uniform(1.1, 3.0)
-            else:
-                factor = random.uniform(0.3, 0.95)
-
-            resolution_h = sla_h * factor
-            inc.resolve(inc.created_at + timedelta(hours=resolution_h))
+            inc.resolve(created + timedelta(hours=float(resolution_h[i])))
 
         logger.info(f"[SIMULATION] {count} incidentes generados.")
         return self.incidents
@@ -2,8 +2,10 @@
 CloudCore SaaS — management/sla_manager.py
 ITIL 4: Gestor de Acuerdos de Nivel de Servicio
 """
-from domain.incident import Incident, Severity
+from domain.incident import Incident, Severity, SLA_LIMITS, PENALTY_RATES
 import logging
+import numpy as np
+from management._sla_kernels import sla_kernel
 
 logger = logging.getLogger(__name__)
 
@@ -17,30 +19,47 @@ class SLAManager:
     def __init__(self):
         self.evaluations = []
 
-    def evaluate(self, incident: Incident) -> str:
-        """Evalúa si un incidente cumple su SLA."""
-        t = incident.resolution_time_hours()
-        if t is None:
-            return "Pendiente"
-        result = "Cumple SLA" if incident.meets_sla() else "Incumple SLA"
-        logger.info(
-            f"[SLA] {incident.incident_id} | {incident.severity.name} | "
-            f"Tiempo: {t:.2f}h | SLA: {incident.sla_limit_hours()}h | {result}"
-        )
+    def _record(self, incident: Incident, t: float, meets: bool, penalty: float) -> str:
+        """Registra la evaluación de un incidente ya resuelto."""
+        severity = incident.severity.name
+        result   = "Cumple SLA" if meets else "Incumple SLA"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[SLA] %s | %s | Tiempo: %.2fh | SLA: %sh | %s",
+                incident.incident_id, severity, t, incident.sla_limit_hours(), result,
+            )
         self.evaluations.append({
             "incident_id": incident.incident_id,
-            "severity":    incident.severity.name,
+            "severity":    severity,
             "result":      result,
-            "penalty_usd": incident.penalty_usd(),
+            "penalty_usd": round(penalty, 2),
         })
         return result
 
+    def evaluate(self, incident: Incident) -> str:
+        """Evalúa si un incidente cumple su SLA."""
+        t = incident.resolution_time_hours()
+        if t is None:
+            return "Pendiente"
+        return self._record(incident, t, incident.meets_sla(), incident.penalty_usd())
+
     def evaluate_batch(self, incidents: list) -> dict:
-        """Evalúa una lista de incidentes y retorna resumen ejecutivo."""
-        results = [self.evaluate(i) for i in incidents]
-        total    = len(incidents)
-        compliant = sum(1 for i in incidents if i.meets_sla())
-        total_penalty = sum(i.penalty_usd() for i in incidents)
+        """Evalúa una lista de incidentes con un kernel vectorizado y retorna resumen ejecutivo."""
+        total = len(incidents)
+        res   = [i.resolution_time_hours() for i in incidents]
+        res_h = np.array(res, dtype=np.float64)   # None → NaN
+        sev   = np.array([i.severity.value for i in incidents], dtype=np.intp)
+        sla_h = SLA_LIMITS[sev]
+        rate  = PENALTY_RATES[sev]
+        meets, penalty = sla_kernel(res_h, sla_h, rate)
+        compliant     = int(meets.sum())
+        total_penalty = float(penalty.sum())
+
+        for inc, t, m, p in zip(incidents, res, meets.tolist(), penalty.tolist()):
+            if t is not None:
+                self._record(inc, t, m, p)
+
+        logger.info("[SLA BATCH] %d incidentes evaluados | %d cumplen SLA", total, compliant)
 
         summary = {
             "total_incidents":    total,
@@ -57,22 +76,32 @@ class SLAManager:
         return summary
 
     def compliance_by_severity(self, incidents: list) -> dict:
-        """Desglosa el cumplimiento SLA por nivel de severidad."""
-        from collections import defaultdict
-        groups = defaultdict(list)
-        for i in incidents:
-            groups[i.severity.name].append(i)
+        """Desglosa el cumplimiento SLA por nivel de severidad (en orden de severidad)."""
+        # Columnas: severidad, cumple, penalización, tiempo
+        cols = np.array([
+            (i.severity.value, i.meets_sla(), i.penalty_usd(), i.resolution_time_hours() or 0.0)
+            for i in incidents
+        ], dtype=np.float64).reshape(-1, 4)
+        # Severity.value (1–4) indexa directamente los acumuladores de np.bincount
+        sev_ids = cols[:, 0].astype(np.intp)
+        meets, penalty, times = cols[:, 1], cols[:, 2], cols[:, 3]
+
+        n_bins      = max(s.value for s in Severity) + 1
+        totals      = np.bincount(sev_ids, minlength=n_bins)
+        compliant   = np.bincount(sev_ids, weights=meets,   minlength=n_bins)
+        penalty_sum = np.bincount(sev_ids, weights=penalty, minlength=n_bins)
+        time_sum    = np.bincount(sev_ids, weights=times,   minlength=n_bins)
 
         breakdown = {}
-        for sev, group in groups.items():
-            compliant = sum(1 for i in group if i.meets_sla())
-            breakdown[sev] = {
-                "total":          len(group),
-                "compliant":      compliant,
-                "pct":            round(compliant / len(group) * 100, 2),
-                "penalty_usd":    round(sum(i.penalty_usd() for i in group), 2),
-                "avg_time_h":     round(
-                    sum(i.resolution_time_hours() for i in group if i.resolution_time_hours()) / len(group), 2
-                ),
+        for sev in Severity:
+            n = int(totals[sev.value])
+            if n == 0:
+                continue
+            breakdown[sev.name] = {
+                "total":          n,
+                "compliant":      int(compliant[sev.value]),
+                "pct":            round(float(compliant[sev.value]) / n * 100, 2),
+                "penalty_usd":    round(float(penalty_sum[sev.value]), 2),
+                "avg_time_h":     round(float(time_sum[sev.value]) / n, 2),
             }
         return breakdown
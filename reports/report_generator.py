@@ -2,14 +2,22 @@
 CloudCore SaaS — reports/report_generator.py
 Generador automático de reportes en texto estructurado y JSON
 """
-import json
-import os
 import logging
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
-OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "cloudcore_saas", "outputs")
+OUTPUT_DIR = Path.home() / "cloudcore_saas" / "outputs"
+LOG_DIR    = OUTPUT_DIR / "logs"
+REPORT_DIR = OUTPUT_DIR / "reportes"
+
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 
 class ReportGenerator:
@@ -19,22 +27,42 @@ class ReportGenerator:
     """
 
     def __init__(self):
-        os.makedirs(f"{OUTPUT_DIR}/reportes", exist_ok=True)
-        os.makedirs(f"{OUTPUT_DIR}/logs",     exist_ok=True)
-
-    def _save_json(self, data: dict, filename: str):
-        path = f"{OUTPUT_DIR}/logs/{filename}"
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
-        logger.info(f"[REPORT] JSON guardado: {path}")
+        self._report_dir = REPORT_DIR
+        self._log_dir    = LOG_DIR
+        self._report_dir.mkdir(parents=True, exist_ok=True)
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        # Logs estructurados por módulo, ya serializados y pendientes de escribir en flush()
+        self._pending: dict[str, bytes] = {}
+        # Las escrituras a disco se solapan con el resto de la simulación
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ReportIO")
+        self._writes: list[Future] = []
+
+    @staticmethod
+    def _write_bytes_sync(path: Path, content: bytes) -> Path:
+        path.write_bytes(content)
+        logger.info("[REPORT] JSON guardado: %s", path)
         return path
 
-    def _save_text(self, content: str, filename: str):
-        path = f"{OUTPUT_DIR}/reportes/{filename}"
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-        logger.info(f"[REPORT] Texto guardado: {path}")
-        return path
+    @staticmethod
+    def _dump(data: dict) -> bytes:
+        # Se serializa en el hilo llamador: los dicts pueden seguir mutando después
+        return orjson.dumps(data, default=str, option=_JSON_OPTIONS)
+
+    def _write_json(self, content: bytes, filename: str) -> Future:
+        future = self._pool.submit(self._write_bytes_sync, self._log_dir / filename, content)
+        self._writes.append(future)
+        return future
+
+    def _save_json(self, data: dict, filename: str) -> Future:
+        return self._write_json(self._dump(data), filename)
+
+    @contextmanager
+    def _open_text(self, filename: str):
+        """Abre un reporte de texto para escritura incremental."""
+        path = self._report_dir / filename
+        with path.open("w", encoding="utf-8") as f:
+            yield f
+        logger.info("[REPORT] Texto guardado: %s", path)
 
     def generate_final_report(self, sla_summary: dict, availability_summary: dict,
                                dashboard_data: dict, continuity_summary: dict) -> str:
@@ -42,19 +70,28 @@ class ReportGenerator:
         now  = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         line = "=" * 65
 
+        # Indicadores usados en la madurez, la plantilla y la lista de criterios
+        comp_rate    = sla_summary.get("compliance_rate_pct", 0)
+        uptime       = availability_summary.get("avg_annual_uptime_pct", 0)
+        maturity_lvl = dashboard_data.get("maturity_level", 0)
+        rto_pct      = continuity_summary.get("rto_compliance_pct", 0)
+
         # Calcular madurez
-        maturity_score = 0
-        if availability_summary.get("avg_annual_uptime_pct", 0) >= 99.9: maturity_score += 1
-        if sla_summary.get("compliance_rate_pct", 0) >= 90:               maturity_score += 1
-        if dashboard_data.get("maturity_level", 0) >= 3:                  maturity_score += 1
-        if continuity_summary.get("rto_compliance_pct", 0) >= 60:         maturity_score += 1
-        if sla_summary.get("compliance_rate_pct", 0) >= 80:               maturity_score += 1
+        ok_uptime = bool(uptime >= 99.9)
+        ok_sla90  = bool(comp_rate >= 90)
+        ok_cobit  = bool(maturity_lvl >= 3)
+        ok_rto    = bool(rto_pct >= 60)
+        ok_sla80  = bool(comp_rate >= 80)
+        maturity_score = int(ok_uptime) + int(ok_sla90) + int(ok_cobit) + int(ok_rto) + int(ok_sla80)
 
         maturity_descs = {5:"Optimizado",4:"Cuantitativamente Gestionado",
                           3:"Definido",2:"Gestionado",1:"Inicial",0:"Inexistente"}
         maturity_txt   = maturity_descs.get(maturity_score, "Inicial")
 
-        report = f"""
+        # Marcas de la lista de criterios
+        mark = {True: "✓", False: "✗"}
+
+        chunks = [f"""
 {line}
    INFORME EJECUTIVO FINAL — CloudCore SaaS
    Sistema Integrado de Gestión TI
@@ -73,14 +110,14 @@ class ReportGenerator:
    Total incidentes:        {sla_summary.get('total_incidents', 0)}
    Cumplen SLA:             {sla_summary.get('compliant', 0)}
    Incumplen SLA:           {sla_summary.get('non_compliant', 0)}
-   Tasa de cumplimiento:    {sla_summary.get('compliance_rate_pct', 0):.2f}%
+   Tasa de cumplimiento:    {comp_rate:.2f}%
    Penalización total:      USD {sla_summary.get('total_penalty_usd', 0):,.2f}
    Estado SLA:              {sla_summary.get('sla_status', 'N/A')}
 
 {line}
 3. DISPONIBILIDAD — ISO/IEC 20000
 {line}
-   Uptime anual promedio:   {availability_summary.get('avg_annual_uptime_pct', 0):.4f}%
+   Uptime anual promedio:   {uptime:.4f}%
    SLA objetivo:            99.9%
    Meses que cumplen SLA:   {availability_summary.get('months_compliant', 0)}/12
    Meses que incumplen:     {availability_summary.get('months_non_compliant', 0)}/12
@@ -94,19 +131,16 @@ class ReportGenerator:
    KPIs evaluados:          {len(dashboard_data.get('kpis', []))}
    KPIs en ALERTA:          {dashboard_data.get('alerts_count', 0)}
    Estado de Gobernanza:    {dashboard_data.get('governance_status', 'N/A')}
-   Madurez COBIT:           {dashboard_data.get('maturity_level', 0)}/5 — {dashboard_data.get('maturity_desc', 'N/A')}
-
-   Decisiones del Comité:"""
-        for dec in dashboard_data.get("committee_decisions", []):
-            report += f"\n   • {dec}"
-
-        report += f"""
+   Madurez COBIT:           {maturity_lvl}/5 — {dashboard_data.get('maturity_desc', 'N/A')}
 
+   Decisiones del Comité:"""]
+        chunks.extend(f"   • {dec}" for dec in dashboard_data.get("committee_decisions", []))
+        chunks.append(f"""
 {line}
 5. CONTINUIDAD DEL NEGOCIO — ISO 22301
 {line}
    Escenarios evaluados:    {continuity_summary.get('total_scenarios', 0)}
-   Cumplen RTO (≤4h):       {continuity_summary.get('rto_compliant', 0)} ({continuity_summary.get('rto_compliance_pct', 0):.1f}%)
+   Cumplen RTO (≤4h):       {continuity_summary.get('rto_compliant', 0)} ({rto_pct:.1f}%)
    Cumplen RPO (≤15min):    {continuity_summary.get('rpo_compliant', 0)} ({continuity_summary.get('rpo_compliance_pct', 0):.1f}%)
    Escenarios críticos:     {continuity_summary.get('critical_scenarios', [])}
    Impacto financiero:      USD {continuity_summary.get('total_financial_impact_usd', 0):,.2f}
@@ -118,11 +152,11 @@ class ReportGenerator:
    Nivel alcanzado:  {maturity_score}/5 — {maturity_txt}
 
    Criterios evaluados:
-   [{'✓' if availability_summary.get('avg_annual_uptime_pct',0)>=99.9 else '✗'}] Disponibilidad anual ≥ 99.9%
-   [{'✓' if sla_summary.get('compliance_rate_pct',0)>=90 else '✗'}] Cumplimiento SLA incidentes ≥ 90%
-   [{'✓' if dashboard_data.get('maturity_level',0)>=3 else '✗'}] Madurez COBIT ≥ Nivel 3
-   [{'✓' if continuity_summary.get('rto_compliance_pct',0)>=60 else '✗'}] RTO cumplimiento ≥ 60%
-   [{'✓' if sla_summary.get('compliance_rate_pct',0)>=80 else '✗'}] Satisfacción/SLA operativo ≥ 80%
+   [{mark[ok_uptime]}] Disponibilidad anual ≥ 99.9%
+   [{mark[ok_sla90]}] Cumplimiento SLA incidentes ≥ 90%
+   [{mark[ok_cobit]}] Madurez COBIT ≥ Nivel 3
+   [{mark[ok_rto]}] RTO cumplimiento ≥ 60%
+   [{mark[ok_sla80]}] Satisfacción/SLA operativo ≥ 80%
 
 {line}
 7. RECOMENDACIONES ESTRATÉGICAS
@@ -139,8 +173,11 @@ class ReportGenerator:
    Repositorio del proyecto:
    https://github.com/dani9873/cloudcore-gestion-ti-maestria
 {line}
-"""
-        self._save_text(report, "informe_final_integrado.txt")
+""")
+        report = "\n".join(chunks)
+        with self._open_text("informe_final_integrado.txt") as f:
+            f.write(report)
+        sys.stdout.write(report + "\n")
         self._save_json({
             "timestamp": datetime.now().isoformat(),
             "sla": sla_summary,
@@ -151,15 +188,33 @@ class ReportGenerator:
             "maturity_desc": maturity_txt,
         }, "informe_final_integrado.json")
 
-        print(report)
         return report
 
     def save_structured_log(self, module: str, data: dict):
-        """Guarda un log estructurado en JSON para un módulo específico."""
-        payload = {
+        """
+        Registra el log estructurado de un módulo específico.
+        Se serializa al registrarlo y flush() escribe log_<module>.json.
+        """
+        self._pending[module] = self._dump({
             "timestamp": datetime.now().isoformat(),
             "module":    module,
             "empresa":   "CloudCore SaaS",
             **data,
-        }
-        self._save_json(payload, f"log_{module.lower().replace(' ', '_')}.json")
+        })
+
+    def flush(self):
+        """
+        Escribe el JSON de cada módulo pendiente (log_<module>.json)
+        y espera a que terminen todas las escrituras en curso.
+        """
+        for module, content in self._pending.items():
+            self._write_json(content, f"log_{module.lower().replace(' ', '_')}.json")
+        self._pending = {}
+        writes, self._writes = self._writes, []
+        for future in writes:
+            future.result()   # propaga errores de E/S al llamador
+
+    def close(self):
+        """Vacía los pendientes y libera el pool de escritura."""
+        self.flush()
+        self._pool.shutdown(wait=True)
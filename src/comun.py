@@ -0,0 +1,42 @@
+"""
+CloudCore SaaS — src/comun.py
+Utilidades compartidas por los scripts diarios: volcado de DataFrames a CSV/consola y figura reutilizable
+
+Los DataFrames conservan la precisión completa; cada script pasa su dict DECIMALES
+para redondear solo al serializar.
+
+Los scripts de src/diaN_* se ejecutan directamente, no como paquete: cada uno agrega
+src/ a sys.path antes de importar este módulo.
+"""
+import sys
+
+_FIG = None
+
+
+def guardar_csv(df, ruta, decimales=None):
+    """Escribe df como CSV, redondeando por columna según decimales"""
+    if decimales is not None:
+        df = df.round(decimales)
+    df.to_csv(ruta, index=False)
+
+
+def mostrar(df, decimales=None):
+    """Imprime df como texto delimitado con el escritor CSV en C, sin el formateador de to_string"""
+    if decimales is not None:
+        df = df.round(decimales)
+    sys.stdout.write(df.to_csv(sep='|', index=False, lineterminator='\n'))
+
+
+def nueva_figura(filas, columnas, figsize):
+    """Retorna (fig, axes) sobre la figura cacheada del proceso, limpia y redimensionada"""
+    global _FIG
+    # Import diferido: matplotlib solo se carga cuando se generan gráficos
+    import matplotlib
+    matplotlib.use('Agg')  # backend sin GUI: evita sondear Tk/Qt
+    import matplotlib.pyplot as plt
+    if _FIG is None:
+        _FIG = plt.figure(figsize=figsize)
+    else:
+        _FIG.clear()
+        _FIG.set_size_inches(figsize)
+    return _FIG, _FIG.subplots(filas, columnas)
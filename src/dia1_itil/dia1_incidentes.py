@@ -8,19 +8,17 @@ Gestión de Incidentes con SLA y Penalizaciones
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import random
-import json
+from datetime import datetime
+from pathlib import Path
+import orjson
 import os
+import sys
 
-
-# === CONFIGURACIÓN ===
-random.seed(42)  # Para reproducibilidad
-np.random.seed(42)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import guardar_csv, mostrar, nueva_figura
 
 
+# === CONFIGURACIÓN ===
 # Directorios de salida
 BASE_DIR = os.path.expanduser('~/cloudcore_saas')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
@@ -45,11 +43,16 @@ PENALIZACION_HORA = {
     'P4': 100
 }
 
+DECIMALES = {'tiempo_real_h': 2, 'exceso_h': 2, 'penalizacion_usd': 2,
+             'tiempo_promedio_h': 2, 'penalizacion_total': 2, 'clientes_promedio': 2}
+
 
 # === GENERACIÓN DE INCIDENTES ===
-def generar_incidentes(n=15):
-    """Simula incidentes del mes para CloudCore SaaS"""
-    tipos = [
+def generar_incidentes(n=15, rng=None):
+    """Simula incidentes del mes para CloudCore SaaS (todas las columnas se generan en lote)"""
+    if rng is None:
+        rng = np.random.default_rng(42)
+    tipos = np.array([
         'Caída base de datos',
         'Falla de autenticación',
         'Timeout en facturación',
@@ -60,51 +63,66 @@ def generar_incidentes(n=15):
         'Falla de backup',
         'Certificado SSL expirado',
         'Corrupción de datos'
-    ]
-    severidades = ['P1','P2','P3','P4']
+    ])
+    equipos = np.array(['Equipo Alpha','Equipo Beta','Equipo Gamma'])
+    severidades = np.array(['P1','P2','P3','P4'])
     pesos = [0.10, 0.25, 0.35, 0.30]
-    incidentes = []
-    fecha_base = datetime(2024, 1, 1, 8, 0, 0)
-    for i in range(n):
-        sev = random.choices(severidades, weights=pesos)[0]
-        sla = SLA_TIEMPOS[sev]
-        # Tiempo de resolución: algunas veces excede el SLA
-        if random.random() < 0.3:  # 30% incumple SLA
-            tiempo_real = sla * random.uniform(1.1, 3.0)
-        else:
-            tiempo_real = sla * random.uniform(0.3, 0.95)
-        fecha_inicio = fecha_base + timedelta(hours=random.randint(1,700))
-        fecha_fin = fecha_inicio + timedelta(hours=tiempo_real)
-        cumple = tiempo_real <= sla
-        exceso = max(0, tiempo_real - sla)
-        penalizacion = exceso * PENALIZACION_HORA[sev] if not cumple else 0
-        incidentes.append({
-            'id': f'INC-2024-{i+1:03d}',
-            'tipo': random.choice(tipos),
-            'severidad': sev,
-            'fecha_inicio': fecha_inicio,
-            'fecha_fin': fecha_fin,
-            'tiempo_real_h': round(tiempo_real, 2),
-            'sla_h': sla,
-            'cumple_sla': cumple,
-            'exceso_h': round(exceso, 2),
-            'penalizacion_usd': round(penalizacion, 2),
-            'tecnico': random.choice(['Equipo Alpha','Equipo Beta','Equipo Gamma']),
-            'clientes_afectados': random.randint(50, 3000) if sev == 'P1' else random.randint(1, 500)
-        })
-    return pd.DataFrame(incidentes)
+    sla_arr = np.array([SLA_TIEMPOS[s] for s in severidades])
+    pen_arr = np.array([PENALIZACION_HORA[s] for s in severidades])
+    fecha_base = pd.Timestamp(2024, 1, 1, 8, 0, 0)
+
+    sev_idx = rng.choice(len(severidades), size=n, p=pesos)
+    sla = sla_arr[sev_idx]
+    # Tiempo de resolución: algunas veces excede el SLA
+    incumple = rng.random(n) < 0.3  # 30% incumple SLA
+    factores = np.where(incumple, rng.uniform(1.1, 3.0, n), rng.uniform(0.3, 0.95, n))
+    tiempo_real = sla * factores
+    fecha_inicio = fecha_base + pd.to_timedelta(rng.integers(1, 701, n), unit='h')
+    fecha_fin = fecha_inicio + pd.to_timedelta(tiempo_real, unit='h').round('us')
+    cumple = tiempo_real <= sla
+    exceso = np.maximum(0, tiempo_real - sla)
+    penalizacion = exceso * pen_arr[sev_idx]   # exceso es 0 cuando cumple
+    clientes = np.where(sev_idx == 0, rng.integers(50, 3001, n), rng.integers(1, 501, n))
+    ids = np.char.add('INC-2024-', np.char.zfill(np.arange(1, n + 1).astype(str), 3))
+
+    return pd.DataFrame({
+        'id': ids,
+        # Columnas de baja cardinalidad como categóricas: códigos enteros + un diccionario
+        'tipo': pd.Categorical.from_codes(rng.integers(0, len(tipos), n), categories=tipos),
+        'severidad': pd.Categorical.from_codes(sev_idx, categories=severidades, ordered=True),
+        'fecha_inicio': fecha_inicio,
+        'fecha_fin': fecha_fin,
+        'tiempo_real_h': tiempo_real,
+        'sla_h': sla,
+        'cumple_sla': cumple,
+        'exceso_h': exceso,
+        'penalizacion_usd': penalizacion,
+        'tecnico': pd.Categorical.from_codes(rng.integers(0, len(equipos), n), categories=equipos),
+        'clientes_afectados': clientes
+    })
 
 
 # === ANÁLISIS SLA ===
 def analizar_sla(df):
-    """Calcula métricas SLA por severidad"""
-    resumen = df.groupby('severidad').agg(
-        total_incidentes=('id','count'),
-        cumplen_sla=('cumple_sla', 'sum'),
-        tiempo_promedio_h=('tiempo_real_h','mean'),
-        penalizacion_total=('penalizacion_usd','sum'),
-        clientes_promedio=('clientes_afectados','mean')
-    ).reset_index()
+    """Calcula métricas SLA por severidad (una pasada np.bincount por métrica)"""
+    categorias = list(SLA_TIEMPOS)
+    sev_idx = pd.Categorical(df['severidad'], categories=categorias).codes
+    n = len(categorias)
+    total = np.bincount(sev_idx, minlength=n)
+    cumplen = np.bincount(sev_idx, weights=df['cumple_sla'].to_numpy(dtype=np.float64), minlength=n)
+    tiempo_sum = np.bincount(sev_idx, weights=df['tiempo_real_h'].to_numpy(), minlength=n)
+    pen_sum = np.bincount(sev_idx, weights=df['penalizacion_usd'].to_numpy(), minlength=n)
+    clientes_sum = np.bincount(sev_idx, weights=df['clientes_afectados'].to_numpy(dtype=np.float64), minlength=n)
+    presentes = total > 0   # como groupby: solo severidades con incidentes
+    total = total[presentes]
+    resumen = pd.DataFrame({
+        'severidad': np.array(categorias)[presentes],
+        'total_incidentes': total,
+        'cumplen_sla': cumplen[presentes].astype(np.int64),
+        'tiempo_promedio_h': tiempo_sum[presentes] / total,
+        'penalizacion_total': pen_sum[presentes],
+        'clientes_promedio': clientes_sum[presentes] / total,
+    })
     resumen['pct_cumplimiento'] = (resumen['cumplen_sla'] / resumen['total_incidentes'] * 100).round(2)
     return resumen
 
@@ -112,14 +130,15 @@ def analizar_sla(df):
 # === VISUALIZACIÓN ===
 def generar_graficos(df, resumen):
     """Genera gráficos de análisis"""
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig, axes = nueva_figura(2, 2, (14, 10))
     fig.suptitle('CloudCore SaaS — Dashboard ITIL 4: Gestión de Incidentes', fontsize=14, fontweight='bold')
 
 
     # Gráfico 1: Incidentes por severidad
-    colores = {'P1':'#c0392b','P2':'#e67e22','P3':'#f39c12','P4':'#27ae60'}
+    colores = pd.Series({'P1':'#c0392b','P2':'#e67e22','P3':'#f39c12','P4':'#27ae60'})
     conteo = df['severidad'].value_counts()
-    axes[0,0].bar(conteo.index, conteo.values, color=[colores.get(s,'gray') for s in conteo.index])
+    axes[0,0].bar(conteo.index, conteo.values,
+                  color=colores.reindex(conteo.index).fillna('gray').to_numpy())
     axes[0,0].set_title('Incidentes por Severidad')
     axes[0,0].set_xlabel('Severidad')
     axes[0,0].set_ylabel('Cantidad')
@@ -135,7 +154,7 @@ def generar_graficos(df, resumen):
 
     # Gráfico 3: Penalizaciones por severidad
     axes[1,0].bar(resumen['severidad'], resumen['penalizacion_total'],
-                  color=[colores.get(s,'gray') for s in resumen['severidad']])
+                  color=colores.reindex(resumen['severidad']).fillna('gray').to_numpy())
     axes[1,0].set_title('Penalizaciones USD por Severidad')
     axes[1,0].set_xlabel('Severidad')
     axes[1,0].set_ylabel('USD')
@@ -153,10 +172,9 @@ def generar_graficos(df, resumen):
     axes[1,1].legend()
 
 
-    plt.tight_layout()
+    fig.tight_layout()
     ruta = f'{OUTPUT_DIR}/graficos/dia1_dashboard_itil.png'
-    plt.savefig(ruta, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(ruta, dpi=100)
     print(f'✅ Gráfico guardado: {ruta}')
 
 
@@ -172,12 +190,12 @@ def guardar_log(df, resumen):
         'total_incidentes': len(df),
         'tasa_cumplimiento_sla': round(tasa_cumplimiento, 2),
         'penalizacion_total_usd': round(total_penalizacion, 2),
-        'resumen_por_severidad': resumen.to_dict('records'),
+        'resumen_por_severidad': resumen.round(DECIMALES).to_dict('records'),
         'estado_sla': 'CUMPLE' if tasa_cumplimiento >= 95 else 'INCUMPLE'
     }
     ruta = f'{OUTPUT_DIR}/logs/dia1_itil_log.json'
-    with open(ruta, 'w', encoding='utf-8') as f:
-        json.dump(log, f, ensure_ascii=False, indent=2, default=str)
+    Path(ruta).write_bytes(orjson.dumps(log, default=str,
+                                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f'✅ Log guardado: {ruta}')
     return log
 
@@ -185,7 +203,7 @@ def guardar_log(df, resumen):
 # === REPORTE CSV ===
 def guardar_reporte(df):
     ruta = f'{OUTPUT_DIR}/reportes/dia1_incidentes.csv'
-    df.to_csv(ruta, index=False)
+    guardar_csv(df, ruta, DECIMALES)
     print(f'✅ Reporte CSV guardado: {ruta}')
 
 
@@ -201,9 +219,9 @@ if __name__ == '__main__':
 
 
     print(f'\n📊 RESUMEN DE INCIDENTES:')
-    print(df[['id','severidad','tiempo_real_h','sla_h','cumple_sla','penalizacion_usd']].to_string(index=False))
+    mostrar(df[['id','severidad','tiempo_real_h','sla_h','cumple_sla','penalizacion_usd']], DECIMALES)
     print(f'\n📈 ANÁLISIS POR SEVERIDAD:')
-    print(resumen.to_string(index=False))
+    mostrar(resumen, DECIMALES)
     print(f'\n💰 Penalización total: USD {df["penalizacion_usd"].sum():,.2f}')
     print(f'📉 Tasa cumplimiento SLA: {df["cumple_sla"].mean()*100:.1f}%')
 
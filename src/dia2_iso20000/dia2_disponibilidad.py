@@ -8,14 +8,16 @@ Cálculo de uptime mensual y evaluación SLA
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from datetime import datetime
-import json, os
+from pathlib import Path
+import orjson, os, sys
 
-
-random_seed = 42
-np.random.seed(random_seed)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import guardar_csv, mostrar, nueva_figura
 
 
 BASE_DIR = os.path.expanduser('~/cloudcore_saas')
@@ -27,30 +29,31 @@ HORAS_MES = 730  # horas promedio por mes
 COSTO_DOWNTIME_HORA = 15000  # USD
 
 
+DECIMALES = {'uptime_pct': 4, 'horas_down': 2, 'minutos_down': 1, 'impacto_financiero_usd': 2}
+
+
 MESES = ['Ene','Feb','Mar','Abr','May','Jun','Jul','Ago','Sep','Oct','Nov','Dic']
 
 
-def simular_disponibilidad():
-    """Simula disponibilidad mensual durante 12 meses"""
-    datos = []
-    for i, mes in enumerate(MESES):
-        # La mayoría de meses cumple SLA, algunos no
-        if i in [2, 7, 10]:  # Meses con incidentes mayores
-            uptime_pct = np.random.uniform(98.5, 99.7)
-        else:
-            uptime_pct = np.random.uniform(99.85, 99.99)
-        horas_down = HORAS_MES * (1 - uptime_pct / 100)
-        cumple = uptime_pct >= SLA_DISPONIBILIDAD
-        impacto = horas_down * COSTO_DOWNTIME_HORA
-        datos.append({
-            'mes': mes,
-            'uptime_pct': round(uptime_pct, 4),
-            'horas_down': round(horas_down, 2),
-            'minutos_down': round(horas_down * 60, 1),
-            'cumple_sla': cumple,
-            'impacto_financiero_usd': round(impacto, 2)
-        })
-    return pd.DataFrame(datos)
+def simular_disponibilidad(rng=None):
+    """Simula disponibilidad mensual durante 12 meses (columnas vectorizadas por mes)"""
+    if rng is None:
+        rng = np.random.default_rng(42)
+    n = len(MESES)
+    # La mayoría de meses cumple SLA, algunos no
+    meses_criticos = np.zeros(n, dtype=bool)
+    meses_criticos[[2, 7, 10]] = True  # Meses con incidentes mayores
+    uptime_pct = np.where(meses_criticos, rng.uniform(98.5, 99.7, n), rng.uniform(99.85, 99.99, n))
+    horas_down = HORAS_MES * (1 - uptime_pct / 100)
+    impacto = horas_down * COSTO_DOWNTIME_HORA
+    return pd.DataFrame({
+        'mes': MESES,
+        'uptime_pct': uptime_pct,
+        'horas_down': horas_down,
+        'minutos_down': horas_down * 60,
+        'cumple_sla': uptime_pct >= SLA_DISPONIBILIDAD,
+        'impacto_financiero_usd': impacto
+    })
 
 
 def generar_reporte_tecnico(df):
@@ -71,14 +74,14 @@ def generar_reporte_tecnico(df):
         'estado_global': 'CUMPLE' if uptime_anual >= SLA_DISPONIBILIDAD else 'REQUIERE_MEJORA'
     }
     ruta = f'{OUTPUT_DIR}/reportes/dia2_disponibilidad_reporte.json'
-    with open(ruta, 'w') as f:
-        json.dump(reporte, f, indent=2, default=lambda x: int(x) if hasattr(x, "__int__") else str(x))
+    # OPT_SERIALIZE_NUMPY cubre los escalares np.int64/np.float64 de los agregados de pandas
+    Path(ruta).write_bytes(orjson.dumps(reporte, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f'✅ Reporte técnico: {ruta}')
     return reporte
 
 
 def generar_graficos(df):
-    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig, axes = nueva_figura(1, 2, (14, 6))
     fig.suptitle('CloudCore SaaS — ISO/IEC 20000: Disponibilidad Anual', fontsize=13, fontweight='bold')
 
 
@@ -103,10 +106,9 @@ def generar_graficos(df):
     axes[1].tick_params(axis='x', rotation=45)
 
 
-    plt.tight_layout()
+    fig.tight_layout()
     ruta = f'{OUTPUT_DIR}/graficos/dia2_disponibilidad.png'
-    plt.savefig(ruta, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(ruta, dpi=100)
     print(f'✅ Gráfico guardado: {ruta}')
 
 
@@ -115,10 +117,10 @@ if __name__ == '__main__':
     print('CloudCore SaaS — ISO/IEC 20000 | Disponibilidad')
     print('=' * 60)
     df = simular_disponibilidad()
-    print(df.to_string(index=False))
+    mostrar(df, DECIMALES)
     reporte = generar_reporte_tecnico(df)
     generar_graficos(df)
-    df.to_csv(f'{OUTPUT_DIR}/reportes/dia2_disponibilidad.csv', index=False)
+    guardar_csv(df, f'{OUTPUT_DIR}/reportes/dia2_disponibilidad.csv', DECIMALES)
     print(f'\n📊 Uptime anual promedio: {df["uptime_pct"].mean():.4f}%')
     print(f'💰 Impacto financiero total: USD {df["impacto_financiero_usd"].sum():,.2f}')
     print('\n✅ Día 2 completado.')
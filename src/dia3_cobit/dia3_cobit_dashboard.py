@@ -7,50 +7,50 @@ COBIT 2019: Dashboard Ejecutivo y KPIs Estratégicos
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from datetime import datetime
-import json, os
+import json, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import guardar_csv, mostrar
 
 
-np.random.seed(42)
 BASE_DIR = os.path.expanduser('~/cloudcore_saas')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
 
 
+DECIMALES = {'disponibilidad_pct': 3, 'riesgo_operativo_score': 2, 'cumplimiento_sla_pct': 2,
+             'satisfaccion_cliente_pct': 2, 'tiempo_despliegue_h': 2}
+
+
 TRIMESTRES = ['Q1-2024','Q2-2024','Q3-2024','Q4-2024']
 
 
-def generar_kpis():
-    """Genera KPIs estratégicos trimestrales alineados con COBIT 2019"""
-    datos = []
-    for q in TRIMESTRES:
-        disponibilidad = np.random.uniform(99.2, 99.98)
-        incidentes_criticos = np.random.randint(0, 5)
-        riesgo_operativo = np.random.uniform(1.5, 4.5)  # escala 1-5
-        cumplimiento_sla = np.random.uniform(85, 99)
-        satisfaccion_cliente = np.random.uniform(75, 95)
-        tiempo_despliegue_h = np.random.uniform(1, 6)
-        datos.append({
-            'trimestre': q,
-            'disponibilidad_pct': round(disponibilidad, 3),
-            'incidentes_criticos': incidentes_criticos,
-            'riesgo_operativo_score': round(riesgo_operativo, 2),
-            'cumplimiento_sla_pct': round(cumplimiento_sla, 2),
-            'satisfaccion_cliente_pct': round(satisfaccion_cliente, 2),
-            'tiempo_despliegue_h': round(tiempo_despliegue_h, 2)
-        })
-    return pd.DataFrame(datos)
+def generar_kpis(rng=None):
+    """Genera KPIs estratégicos trimestrales alineados con COBIT 2019 (un lote por KPI)"""
+    if rng is None:
+        rng = np.random.default_rng(42)
+    n = len(TRIMESTRES)
+    return pd.DataFrame({
+        'trimestre': TRIMESTRES,
+        'disponibilidad_pct': rng.uniform(99.2, 99.98, n),
+        'incidentes_criticos': rng.integers(0, 5, n),
+        'riesgo_operativo_score': rng.uniform(1.5, 4.5, n),  # escala 1-5
+        'cumplimiento_sla_pct': rng.uniform(85, 99, n),
+        'satisfaccion_cliente_pct': rng.uniform(75, 95, n),
+        'tiempo_despliegue_h': rng.uniform(1, 6, n)
+    })
 
 
 def calcular_nivel_madurez(df):
     """Calcula nivel de madurez COBIT (0-5)"""
-    puntaje = 0
-    if df['disponibilidad_pct'].mean() >= 99.9: puntaje += 1
-    if df['incidentes_criticos'].mean() < 2: puntaje += 1
-    if df['riesgo_operativo_score'].mean() < 3: puntaje += 1
-    if df['cumplimiento_sla_pct'].mean() >= 95: puntaje += 1
-    if df['satisfaccion_cliente_pct'].mean() >= 85: puntaje += 1
+    m = df[['disponibilidad_pct', 'incidentes_criticos', 'riesgo_operativo_score',
+            'cumplimiento_sla_pct', 'satisfaccion_cliente_pct']].mean().to_numpy()
+    criterios = (m[0] >= 99.9, m[1] < 2, m[2] < 3, m[3] >= 95, m[4] >= 85)
+    puntaje = int(sum(criterios))  # sum() de Python: np.bool_ + np.bool_ sería un OR lógico
     niveles = {5:'Optimizado',4:'Gestionado',3:'Establecido',2:'Gestionado informalmente',1:'Inicial',0:'Inexistente'}
     return puntaje, niveles.get(puntaje, 'Inicial')
 
@@ -131,7 +131,8 @@ def generar_dashboard_ejecutivo(df):
 
     plt.tight_layout(rect=[0, 0, 1, 0.95])
     ruta = f'{OUTPUT_DIR}/graficos/dia3_dashboard_cobit.png'
-    plt.savefig(ruta, dpi=150, facecolor=fig.get_facecolor(), bbox_inches='tight')
+    # La tercera fila de la grilla queda vacía: aquí sí se conserva el recorte ajustado
+    plt.savefig(ruta, dpi=100, facecolor=fig.get_facecolor(), bbox_inches='tight')
     plt.close()
     print(f'✅ Dashboard guardado: {ruta}')
 
@@ -141,10 +142,10 @@ if __name__ == '__main__':
     print('CloudCore SaaS — COBIT 2019 | Dashboard Ejecutivo')
     print('=' * 60)
     df = generar_kpis()
-    print(df.to_string(index=False))
+    mostrar(df, DECIMALES)
     puntaje, nivel = calcular_nivel_madurez(df)
     print(f'\n🎯 Nivel de Madurez COBIT: {puntaje}/5 — {nivel}')
     generar_dashboard_ejecutivo(df)
-    df.to_csv(f'{OUTPUT_DIR}/reportes/dia3_kpis.csv', index=False)
+    guardar_csv(df, f'{OUTPUT_DIR}/reportes/dia3_kpis.csv', DECIMALES)
     print('\n✅ Día 3 completado.')
 
@@ -8,18 +8,29 @@ Dashboard ejecutivo + Informe PDF automático
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import json, os, sys
+import io, json, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import mostrar
+
+# Sin validación de atributos por objeto de ReportLab: el informe usa parámetros fijos
+rl_config.shapeChecking = 0
+
+# Los procesos hijos heredan el backend sin volver a resolverlo
+os.environ.setdefault('MPLBACKEND', 'Agg')
 
 
-np.random.seed(42)
 BASE_DIR = os.path.expanduser('~/cloudcore_saas')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
 os.makedirs(f'{OUTPUT_DIR}/pdf', exist_ok=True)
@@ -28,26 +39,31 @@ os.makedirs(f'{OUTPUT_DIR}/pdf', exist_ok=True)
 # =============================================
 # MÓDULO 1: GESTIÓN DE INCIDENTES (ITIL 4)
 # =============================================
-def modulo_incidentes():
-    SLA = {'P1':1,'P2':4,'P3':8,'P4':24}
-    severidades = np.random.choice(['P1','P2','P3','P4'], 20, p=[0.1,0.2,0.4,0.3])
-    resultados = []
-    for sev in severidades:
-        t = SLA[sev] * np.random.uniform(0.4, 2.0)
-        resultados.append({'severidad':sev, 'tiempo_h':round(t,2), 'cumple':t<=SLA[sev]})
-    df = pd.DataFrame(resultados)
-    tasa = df['cumple'].mean() * 100
+def modulo_incidentes(rng=None):
+    if rng is None:
+        rng = np.random.default_rng(42)
+    sev_arr = np.array(['P1','P2','P3','P4'])
+    sla_arr = np.array([1, 4, 8, 24])
+    idx = rng.choice(len(sev_arr), 20, p=[0.1,0.2,0.4,0.3])
+    sla = sla_arr[idx]
+    t = sla * rng.uniform(0.4, 2.0, idx.size)
+    cumple = t <= sla
+    df = pd.DataFrame({'severidad':pd.Categorical.from_codes(idx, categories=sev_arr, ordered=True),
+                       'tiempo_h':t, 'cumple':cumple})
+    tasa = cumple.mean() * 100
     return df, round(tasa, 2)
 
 
 # =============================================
 # MÓDULO 2: DISPONIBILIDAD (ISO 20000)
 # =============================================
-def modulo_disponibilidad():
+def modulo_disponibilidad(rng=None):
+    if rng is None:
+        rng = np.random.default_rng(42)
     meses = ['Ene','Feb','Mar','Abr','May','Jun','Jul','Ago','Sep','Oct','Nov','Dic']
-    uptimes = np.random.uniform(99.0, 99.99, 12)
+    uptimes = rng.uniform(99.0, 99.99, 12)
     uptimes[2] = 98.8; uptimes[7] = 99.1  # simulamos meses problemáticos
-    df = pd.DataFrame({'mes':meses,'uptime':uptimes.round(3)})
+    df = pd.DataFrame({'mes':meses,'uptime':uptimes})
     uptime_anual = uptimes.mean()
     return df, round(uptime_anual, 3)
 
@@ -69,29 +85,23 @@ def modulo_kpis():
 # =============================================
 # MÓDULO 4: CONTINUIDAD (ISO 22301)
 # =============================================
-def modulo_continuidad():
-    escenarios = [
-        {'nombre':'BD Fallo','rto_real':np.random.uniform(2,7),'rto_obj':4.0},
-        {'nombre':'Ransomware','rto_real':np.random.uniform(8,24),'rto_obj':4.0},
-        {'nombre':'Cloud Down','rto_real':np.random.uniform(1,5),'rto_obj':4.0},
-    ]
-    for e in escenarios:
-        e['cumple'] = e['rto_real'] <= e['rto_obj']
-        e['impacto_usd'] = e['rto_real'] * 15000
-    df = pd.DataFrame(escenarios)
-    return df
+def modulo_continuidad(rng=None):
+    if rng is None:
+        rng = np.random.default_rng(42)
+    rto_real = rng.uniform([2, 8, 1], [7, 24, 5])
+    rto_obj = 4.0
+    return pd.DataFrame({'nombre':['BD Fallo','Ransomware','Cloud Down'],
+                         'rto_real':rto_real, 'rto_obj':rto_obj,
+                         'cumple':rto_real <= rto_obj, 'impacto_usd':rto_real * 15000})
 
 
 # =============================================
 # NIVEL DE MADUREZ INTEGRADO
 # =============================================
 def calcular_madurez(tasa_sla, uptime, kpis, df_cont):
-    puntaje = 0
-    if tasa_sla >= 90: puntaje += 1
-    if uptime >= 99.9: puntaje += 1
-    if kpis['Cumplimiento SLA'] >= 90: puntaje += 1
-    if df_cont['cumple'].mean() >= 0.6: puntaje += 1
-    if kpis['Satisfacción Cliente'] >= 80: puntaje += 1
+    criterios = (tasa_sla >= 90, uptime >= 99.9, kpis['Cumplimiento SLA'] >= 90,
+                 df_cont['cumple'].mean() >= 0.6, kpis['Satisfacción Cliente'] >= 80)
+    puntaje = int(sum(criterios))
     niveles = {5:'Optimizado (Nivel 5)',4:'Gestionado (Nivel 4)',
                3:'Establecido (Nivel 3)',2:'Gestionado Informalmente (Nivel 2)',
                1:'Inicial (Nivel 1)',0:'Inexistente (Nivel 0)'}
@@ -101,84 +111,89 @@ def calcular_madurez(tasa_sla, uptime, kpis, df_cont):
 # =============================================
 # DASHBOARD INTEGRADO
 # =============================================
-def dashboard_integrado(df_inc, df_disp, kpis, df_cont, tasa_sla, uptime, madurez_txt):
-    fig = plt.figure(figsize=(18, 14))
-    fig.patch.set_facecolor('#0d1117')
-    gs = gridspec.GridSpec(3, 4, figure=fig, hspace=0.45, wspace=0.3)
+# Tema oscuro del dashboard
+_ESTILO_DASHBOARD = {'figure.facecolor': '#0d1117', 'axes.facecolor': '#161b22',
+                     'axes.edgecolor': '#30363d', 'axes.labelcolor': '#f0f6fc',
+                     'axes.titlecolor': '#f0f6fc', 'axes.titlesize': 9, 'axes.titleweight': 'bold',
+                     'xtick.color': '#8b949e', 'ytick.color': '#8b949e',
+                     'xtick.labelsize': 8, 'ytick.labelsize': 8}
 
+# Nivel numérico dentro del paréntesis de madurez_txt, p. ej. 'Establecido (Nivel 3)' -> '3'
+_MADUREZ_RE = re.compile(r'\(([^)]*)\)')
 
-    def style(ax, title):
-        ax.set_facecolor('#161b22')
-        ax.set_title(title, color='#f0f6fc', fontsize=9, fontweight='bold', pad=6)
-        ax.tick_params(colors='#8b949e', labelsize=8)
-        for spine in ax.spines.values(): spine.set_color('#30363d')
+
+@plt.rc_context(_ESTILO_DASHBOARD)
+def dashboard_integrado(df_inc, df_disp, kpis, df_cont, tasa_sla, uptime, madurez_txt):
+    # Márgenes fijos: tight_layout no admite el eje polar
+    fig, axd = plt.subplot_mosaic([['inc', 'sla', 'disp', 'disp'],
+                                   ['radar', 'radar', 'rto', 'rto'],
+                                   ['.', 'mad', 'mad', '.']],
+                                  figsize=(18, 14),
+                                  gridspec_kw={'left': 0.05, 'right': 0.98, 'top': 0.93, 'bottom': 0.06,
+                                               'hspace': 0.45, 'wspace': 0.3},
+                                  per_subplot_kw={'radar': {'projection': 'polar'}})
 
 
     # Incidentes
-    ax1 = fig.add_subplot(gs[0,0])
-    style(ax1, 'Incidentes por Severidad')
-    cnt = df_inc['severidad'].value_counts().sort_index()
-    colors_bar = ['#f85149','#f0883e','#d29922','#3fb950']
-    ax1.bar(cnt.index, cnt.values, color=colors_bar[:len(cnt)])
+    axd['inc'].set_title('Incidentes por Severidad')
+    sev = df_inc['severidad'].cat
+    counts = np.bincount(sev.codes.to_numpy(), minlength=len(sev.categories))
+    idx = np.nonzero(counts)[0]   # solo severidades presentes, cada una con su color
+    colors_bar = np.array(['#f85149','#f0883e','#d29922','#3fb950'])
+    axd['inc'].bar(sev.categories[idx], counts[idx], color=colors_bar[idx])
 
 
     # Cumplimiento SLA
-    ax2 = fig.add_subplot(gs[0,1])
-    style(ax2, f'SLA {tasa_sla:.1f}%')
-    cumple = df_inc['cumple'].sum(); incumple = len(df_inc) - cumple
-    ax2.pie([cumple, incumple], labels=['Cumple','Incumple'],
-            colors=['#3fb950','#f85149'], autopct='%1.0f%%', textprops={'color':'white','fontsize':8})
+    axd['sla'].set_title(f'SLA {tasa_sla:.1f}%')
+    cumple = int(df_inc['cumple'].to_numpy().sum()); incumple = len(df_inc) - cumple
+    axd['sla'].pie([cumple, incumple], labels=['Cumple','Incumple'],
+                   colors=['#3fb950','#f85149'], autopct='%1.0f%%', textprops={'color':'white','fontsize':8})
 
 
     # Disponibilidad mensual
-    ax3 = fig.add_subplot(gs[0,2:4])
-    style(ax3, f'Disponibilidad Mensual (Anual: {uptime:.3f}%)')
-    c_up = ['#3fb950' if u >= 99.9 else '#f85149' for u in df_disp['uptime']]
-    ax3.bar(df_disp['mes'], df_disp['uptime'], color=c_up)
-    ax3.axhline(99.9, color='#58a6ff', linestyle='--', linewidth=1.5, label='SLA 99.9%')
-    ax3.set_ylim(98, 100.05)
-    ax3.legend(facecolor='#161b22', labelcolor='white', fontsize=8)
-    ax3.tick_params(axis='x', rotation=45)
+    axd['disp'].set_title(f'Disponibilidad Mensual (Anual: {uptime:.3f}%)')
+    c_up = np.where(df_disp['uptime'].to_numpy() >= 99.9, '#3fb950', '#f85149')
+    axd['disp'].bar(df_disp['mes'], df_disp['uptime'], color=c_up)
+    axd['disp'].axhline(99.9, color='#58a6ff', linestyle='--', linewidth=1.5, label='SLA 99.9%')
+    axd['disp'].set_ylim(98, 100.05)
+    axd['disp'].legend(facecolor='#161b22', labelcolor='white', fontsize=8)
+    axd['disp'].tick_params(axis='x', rotation=45)
 
 
     # KPIs Radar
-    ax4 = fig.add_subplot(gs[1,0:2], polar=True)
-    ax4.set_facecolor('#161b22')
     labels_kpi = list(kpis.keys())
-    valores = list(kpis.values())
     N = len(labels_kpi)
-    angles = [n / float(N) * 2 * np.pi for n in range(N)]
-    angles += angles[:1]
-    valores_plot = valores + valores[:1]
-    ax4.plot(angles, valores_plot, 'o-', color='#58a6ff', linewidth=2)
-    ax4.fill(angles, valores_plot, alpha=0.25, color='#58a6ff')
-    ax4.set_xticks(angles[:-1])
-    ax4.set_xticklabels(labels_kpi, color='white', size=7)
-    ax4.set_ylim(0, 100)
-    ax4.set_title('KPIs COBIT 2019', color='white', size=9, fontweight='bold', pad=15)
-    ax4.tick_params(colors='#8b949e')
-    ax4.spines['polar'].set_color('#30363d')
+    angles = np.linspace(0, 2 * np.pi, N, endpoint=False)
+    valores = np.fromiter(kpis.values(), dtype=np.float64, count=N)
+    # Polígono cerrado: se repite el primer vértice al final
+    angles_c = np.concatenate([angles, angles[:1]])
+    valores_c = np.concatenate([valores, valores[:1]])
+    axd['radar'].plot(angles_c, valores_c, 'o-', color='#58a6ff', linewidth=2)
+    axd['radar'].fill(angles_c, valores_c, alpha=0.25, color='#58a6ff')
+    axd['radar'].set_xticks(angles)
+    axd['radar'].set_xticklabels(labels_kpi, size=7)
+    axd['radar'].set_ylim(0, 100)
+    axd['radar'].set_title('KPIs COBIT 2019', color='white', size=9, fontweight='bold', pad=15)
+    axd['radar'].tick_params(axis='y', labelsize='medium')   # escala radial con el tamaño por defecto
 
 
     # Continuidad RTO
-    ax5 = fig.add_subplot(gs[1,2:4])
-    style(ax5, 'Continuidad: RTO Real vs Objetivo')
-    c_rto = ['#3fb950' if c else '#f85149' for c in df_cont['cumple']]
-    ax5.barh(df_cont['nombre'], df_cont['rto_real'], color=c_rto)
-    ax5.axvline(4.0, color='#58a6ff', linestyle='--', linewidth=2, label='RTO Obj 4h')
-    ax5.legend(facecolor='#161b22', labelcolor='white', fontsize=8)
+    axd['rto'].set_title('Continuidad: RTO Real vs Objetivo')
+    c_rto = np.where(df_cont['cumple'].to_numpy(), '#3fb950', '#f85149')
+    axd['rto'].barh(df_cont['nombre'], df_cont['rto_real'], color=c_rto)
+    axd['rto'].axvline(4.0, color='#58a6ff', linestyle='--', linewidth=2, label='RTO Obj 4h')
+    axd['rto'].legend(facecolor='#161b22', labelcolor='white', fontsize=8)
 
 
     # Nivel madurez
-    ax6 = fig.add_subplot(gs[2,1:3])
-    ax6.set_facecolor('#161b22')
-    ax6.axis('off')
-    madurez_num = madurez_txt.split('(')[1].split(')')[0].split(' ')[-1] if '(' in madurez_txt else '?'
-    ax6.text(0.5, 0.65, madurez_num, ha='center', va='center', fontsize=80,
-             color='#58a6ff', fontweight='bold', transform=ax6.transAxes)
-    ax6.text(0.5, 0.3, madurez_txt, ha='center', va='center', fontsize=12,
-             color='white', transform=ax6.transAxes)
-    ax6.set_title('Nivel de Madurez Integrado', color='white', size=10, fontweight='bold')
+    axd['mad'].axis('off')
+    m = _MADUREZ_RE.search(madurez_txt)
+    madurez_num = m.group(1).rsplit(' ', 1)[-1] if m else '?'
+    axd['mad'].text(0.5, 0.65, madurez_num, ha='center', va='center', fontsize=80,
+                    color='#58a6ff', fontweight='bold', transform=axd['mad'].transAxes)
+    axd['mad'].text(0.5, 0.3, madurez_txt, ha='center', va='center', fontsize=12,
+                    color='white', transform=axd['mad'].transAxes)
+    axd['mad'].set_title('Nivel de Madurez Integrado', color='white', size=10, fontweight='bold')
 
 
     fig.text(0.5, 0.985, '🚀 CLOUDCORE SaaS — MODELO INTEGRADO ITIL4+ISO20000+COBIT2019+ISO22301',
@@ -187,155 +202,174 @@ def dashboard_integrado(df_inc, df_disp, kpis, df_cont, tasa_sla, uptime, madure
              ha='center', va='top', fontsize=9, color='#8b949e')
 
 
-    plt.tight_layout(rect=[0,0,1,0.95])
-    ruta = f'{OUTPUT_DIR}/graficos/dia5_dashboard_integrado.png'
-    plt.savefig(ruta, dpi=150, facecolor=fig.get_facecolor(), bbox_inches='tight')
-    plt.close()
+    ruta = f'{OUTPUT_DIR}/graficos/dia5_dashboard_integrado.jpg'
+    # Sin recorte: los márgenes fijos del mosaico ya ajustan los paneles al lienzo
+    fig.savefig(ruta, dpi=100, facecolor=fig.get_facecolor(), pil_kwargs={'quality': 85, 'optimize': True})
+    plt.close(fig)
     print(f'✅ Dashboard integrado: {ruta}')
 
 
 # =============================================
 # GENERACIÓN PDF CON REPORTLAB
 # =============================================
+# Paleta y estilos del informe
+_AZUL_OSC = colors.HexColor('#1F4E79')
+_AZUL = colors.HexColor('#2E75B6')
+_GRIS = colors.HexColor('#BDC3C7')
+_FILA_ALT = colors.HexColor('#EBF5FB')
+
+_ESTILOS = getSampleStyleSheet()
+_TITULO = ParagraphStyle('Titulo', parent=_ESTILOS['Title'], fontSize=20, textColor=_AZUL_OSC, spaceAfter=6)
+_H1 = ParagraphStyle('H1', parent=_ESTILOS['Heading1'], fontSize=14, textColor=_AZUL,
+                     spaceAfter=6, spaceBefore=16)
+_H2 = ParagraphStyle('H2', parent=_ESTILOS['Heading2'], fontSize=12, textColor=_AZUL_OSC,
+                     spaceAfter=4, spaceBefore=10)
+_NORMAL = ParagraphStyle('Cuerpo', parent=_ESTILOS['Normal'], fontSize=10, leading=14)
+_PIE = ParagraphStyle('Pie', parent=_ESTILOS['Normal'], fontSize=8, textColor=colors.grey)
+# Primera columna de las tablas como Paragraph: los textos largos se ajustan a la celda
+_CELDA = ParagraphStyle('Celda', parent=_ESTILOS['Normal'], fontSize=9, leading=11)
+
+_ESTILO_TABLA_KPI = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), _AZUL_OSC),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [_FILA_ALT, colors.white]),
+    ('GRID', (0,0), (-1,-1), 0.5, _GRIS),
+    ('ALIGN', (1,0), (-1,-1), 'CENTER'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+])
+_ESTILO_TABLA_MADUREZ = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), _AZUL),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('GRID', (0,0), (-1,-1), 0.5, _GRIS),
+    ('ALIGN', (1,0), (-1,-1), 'CENTER'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+])
+
+_RECOMENDACIONES = [
+    '1. Implementar monitoreo proactivo 24/7 con alertas automatizadas para incidentes P1/P2.',
+    '2. Establecer réplica geográfica activo-activo para eliminar single points of failure en BD.',
+    '3. Actualizar el DRP con procedimientos específicos para ransomware con tiempo objetivo &lt; 4h.',
+    '4. Crear un comité de Continuidad de Negocio con reuniones quincenales y KPIs formales.',
+    '5. Implementar chaos engineering para validar RTO en entornos de staging mensualmente.',
+    '6. Certificar el SMS bajo ISO/IEC 20000 para fortalecer la confianza de los clientes.',
+    '7. Aumentar la inversión en capacitación del equipo ITSM para reducir tiempo de resolución.',
+]
+
+
+def _tabla(filas, anchos, estilo):
+    """Table con la cabecera como texto y la primera columna del cuerpo ajustable"""
+    cuerpo = [[Paragraph(fila[0], _CELDA), *fila[1:]] for fila in filas[1:]]
+    t = Table([filas[0], *cuerpo], colWidths=anchos)
+    t.setStyle(estilo)
+    return t
+
+
 def generar_pdf(tasa_sla, uptime, kpis, df_cont, puntaje_madurez, madurez_txt):
     ruta_pdf = f'{OUTPUT_DIR}/pdf/informe_final_cloudcore.pdf'
-    doc = SimpleDocTemplate(ruta_pdf, pagesize=A4,
+    cumple_cont = float(df_cont['cumple'].to_numpy().mean())
+    uptime_ok = bool(uptime >= 99.9)
+    sla_ok = bool(tasa_sla >= 90)
+    cobit_sla_ok = bool(kpis['Cumplimiento SLA'] >= 90)
+    rto_ok = cumple_cont >= 0.6
+    sat_ok = bool(kpis['Satisfacción Cliente'] >= 80)
+    marca = {True: '✓', False: '✗'}
+    sla_s, up_s = f'{tasa_sla}%', f'{uptime}%'
+    impacto_total = float(df_cont['impacto_usd'].to_numpy().sum())
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
                             rightMargin=2*cm, leftMargin=2*cm,
                             topMargin=2*cm, bottomMargin=2*cm)
-    styles = getSampleStyleSheet()
     story = []
 
 
-    titulo_style = ParagraphStyle('Titulo', parent=styles['Title'],
-                                   fontSize=20, textColor=colors.HexColor('#1F4E79'),
-                                   spaceAfter=6)
-    h1_style = ParagraphStyle('H1', parent=styles['Heading1'],
-                               fontSize=14, textColor=colors.HexColor('#2E75B6'),
-                               spaceAfter=6, spaceBefore=16)
-    h2_style = ParagraphStyle('H2', parent=styles['Heading2'],
-                               fontSize=12, textColor=colors.HexColor('#1F4E79'),
-                               spaceAfter=4, spaceBefore=10)
-    normal = styles['Normal']
-    normal.fontSize = 10
-    normal.leading = 14
-
-
     # Portada
-    story.append(Paragraph('INFORME EJECUTIVO FINAL', titulo_style))
-    story.append(Paragraph('CloudCore SaaS — Sistema Integrado de Gestión TI', styles['Heading2']))
+    story.append(Paragraph('INFORME EJECUTIVO FINAL', _TITULO))
+    story.append(Paragraph('CloudCore SaaS — Sistema Integrado de Gestión TI', _ESTILOS['Heading2']))
     story.append(Spacer(1, 0.3*cm))
-    story.append(HRFlowable(width='100%', thickness=2, color=colors.HexColor('#2E75B6')))
+    story.append(HRFlowable(width='100%', thickness=2, color=_AZUL))
     story.append(Spacer(1, 0.3*cm))
-    story.append(Paragraph(f'Fecha de generación: {datetime.now().strftime("%d/%m/%Y %H:%M")}', normal))
-    story.append(Paragraph('Marcos aplicados: ITIL 4 | ISO/IEC 20000 | COBIT 2019 | ISO 22301', normal))
+    story.append(Paragraph(f'Fecha de generación: {datetime.now().strftime("%d/%m/%Y %H:%M")}', _NORMAL))
+    story.append(Paragraph('Marcos aplicados: ITIL 4 | ISO/IEC 20000 | COBIT 2019 | ISO 22301', _NORMAL))
     story.append(Spacer(1, 0.5*cm))
 
 
     # Resumen ejecutivo
-    story.append(Paragraph('1. RESUMEN EJECUTIVO', h1_style))
+    story.append(Paragraph('1. RESUMEN EJECUTIVO', _H1))
     resumen = f'''CloudCore SaaS opera una plataforma crítica de facturación electrónica para 3,000 empresas 
     con dependencia 100% en TI. Este informe consolida los resultados del análisis integrado bajo cuatro marcos 
     de referencia internacionales. El nivel de madurez alcanzado es <b>{madurez_txt}</b>, con una tasa de 
-    cumplimiento SLA de incidentes de <b>{tasa_sla}%</b> y disponibilidad anual promedio de <b>{uptime}%</b>.'''
-    story.append(Paragraph(resumen, normal))
+    cumplimiento SLA de incidentes de <b>{sla_s}</b> y disponibilidad anual promedio de <b>{up_s}</b>.'''
+    story.append(Paragraph(resumen, _NORMAL))
     story.append(Spacer(1, 0.3*cm))
 
 
     # Tabla de indicadores clave
-    story.append(Paragraph('2. INDICADORES CLAVE DE DESEMPEÑO', h1_style))
-    tabla_data = [['Indicador','Valor','Marco','Estado']]
-    tabla_data.append(['Disponibilidad Anual', f'{uptime}%', 'ISO 20000', '✓ CUMPLE' if uptime >= 99.9 else '✗ ALERTA'])
-    tabla_data.append(['Cumplimiento SLA Incidentes', f'{tasa_sla}%', 'ITIL 4', '✓ OK' if tasa_sla >= 90 else '✗ REVISAR'])
-    for k, v in kpis.items():
-        tabla_data.append([k, f'{v}%', 'COBIT 2019', '✓ OK' if v >= 80 else '⚠ REVISAR'])
-    tabla_data.append(['RTO Cumplimiento', f"{df_cont['cumple'].mean()*100:.0f}%", 'ISO 22301', '✓ OK' if df_cont['cumple'].mean() >= 0.6 else '✗ CRÍTICO'])
-
-
-    t = Table(tabla_data, colWidths=[6*cm, 3*cm, 3.5*cm, 2.5*cm])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#1F4E79')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.HexColor('#EBF5FB'), colors.white]),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#BDC3C7')),
-        ('ALIGN', (1,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-    ]))
-    story.append(t)
+    story.append(Paragraph('2. INDICADORES CLAVE DE DESEMPEÑO', _H1))
+    tabla_data = [
+        ['Indicador','Valor','Marco','Estado'],
+        ['Disponibilidad Anual', up_s, 'ISO 20000', '✓ CUMPLE' if uptime_ok else '✗ ALERTA'],
+        ['Cumplimiento SLA Incidentes', sla_s, 'ITIL 4', '✓ OK' if sla_ok else '✗ REVISAR'],
+        *[[k, f'{v}%', 'COBIT 2019', '✓ OK' if v >= 80 else '⚠ REVISAR'] for k, v in kpis.items()],
+        ['RTO Cumplimiento', f"{cumple_cont*100:.0f}%", 'ISO 22301', '✓ OK' if rto_ok else '✗ CRÍTICO'],
+    ]
+    story.append(_tabla(tabla_data, [6*cm, 3*cm, 3.5*cm, 2.5*cm], _ESTILO_TABLA_KPI))
     story.append(Spacer(1, 0.5*cm))
 
 
     # Análisis por marco
-    story.append(Paragraph('3. ANÁLISIS POR MARCO DE REFERENCIA', h1_style))
+    story.append(Paragraph('3. ANÁLISIS POR MARCO DE REFERENCIA', _H1))
 
 
-    story.append(Paragraph('3.1 ITIL 4 — Gestión de Incidentes', h2_style))
-    story.append(Paragraph(f'La tasa de cumplimiento SLA alcanzó el {tasa_sla}%. Los incidentes P1 representan el mayor riesgo operativo con impacto en todos los clientes simultáneamente. Se recomienda automatizar la detección y escalamiento.', normal))
+    story.append(Paragraph('3.1 ITIL 4 — Gestión de Incidentes', _H2))
+    story.append(Paragraph(f'La tasa de cumplimiento SLA alcanzó el {sla_s}. Los incidentes P1 representan el mayor riesgo operativo con impacto en todos los clientes simultáneamente. Se recomienda automatizar la detección y escalamiento.', _NORMAL))
 
 
-    story.append(Paragraph('3.2 ISO/IEC 20000 — Disponibilidad', h2_style))
-    estado_disp = 'cumple' if uptime >= 99.9 else 'no cumple'
-    story.append(Paragraph(f'La disponibilidad anual promedio de {uptime}% {estado_disp} el SLA objetivo de 99.9%. Tres meses presentaron caídas por debajo del umbral aceptable, requiriendo plan de mejora inmediato.', normal))
+    story.append(Paragraph('3.2 ISO/IEC 20000 — Disponibilidad', _H2))
+    estado_disp = 'cumple' if uptime_ok else 'no cumple'
+    story.append(Paragraph(f'La disponibilidad anual promedio de {up_s} {estado_disp} el SLA objetivo de 99.9%. Tres meses presentaron caídas por debajo del umbral aceptable, requiriendo plan de mejora inmediato.', _NORMAL))
 
 
-    story.append(Paragraph('3.3 COBIT 2019 — Gobernanza', h2_style))
-    story.append(Paragraph('El comité de gobierno TI identificó brechas en satisfacción del cliente y cumplimiento SLA que requieren inversión en capacidad y automatización de procesos de recuperación.', normal))
+    story.append(Paragraph('3.3 COBIT 2019 — Gobernanza', _H2))
+    story.append(Paragraph('El comité de gobierno TI identificó brechas en satisfacción del cliente y cumplimiento SLA que requieren inversión en capacidad y automatización de procesos de recuperación.', _NORMAL))
 
 
-    story.append(Paragraph('3.4 ISO 22301 — Continuidad', h2_style))
+    story.append(Paragraph('3.4 ISO 22301 — Continuidad', _H2))
     esc_criticos = df_cont[~df_cont['cumple']]['nombre'].tolist()
-    story.append(Paragraph(f'Los escenarios que incumplen el RTO objetivo de 4 horas son: {esc_criticos}. El impacto financiero potencial acumulado supera los USD {df_cont["impacto_usd"].sum():,.0f}. Se requiere actualización urgente del DRP.', normal))
+    story.append(Paragraph(f'Los escenarios que incumplen el RTO objetivo de 4 horas son: {esc_criticos}. El impacto financiero potencial acumulado supera los USD {impacto_total:,.0f}. Se requiere actualización urgente del DRP.', _NORMAL))
     story.append(Spacer(1, 0.3*cm))
 
 
     # Nivel de madurez
-    story.append(Paragraph('4. EVALUACIÓN DE MADUREZ', h1_style))
-    story.append(Paragraph(f'El nivel de madurez integrado evaluado según COBIT 2019 es: <b>{madurez_txt}</b> ({puntaje_madurez}/5 criterios cumplidos).', normal))
+    story.append(Paragraph('4. EVALUACIÓN DE MADUREZ', _H1))
+    story.append(Paragraph(f'El nivel de madurez integrado evaluado según COBIT 2019 es: <b>{madurez_txt}</b> ({puntaje_madurez}/5 criterios cumplidos).', _NORMAL))
 
 
     madurez_tabla = [['Criterio','Estado','Puntaje'],
-        [f'Disponibilidad ≥ 99.9%', '✓' if uptime >= 99.9 else '✗', '1' if uptime >= 99.9 else '0'],
-        [f'SLA Incidentes ≥ 90%', '✓' if tasa_sla >= 90 else '✗', '1' if tasa_sla >= 90 else '0'],
-        ['Cumplimiento SLA COBIT ≥ 90%', '✓' if kpis['Cumplimiento SLA'] >= 90 else '✗', '1' if kpis['Cumplimiento SLA'] >= 90 else '0'],
-        ['RTO Cumplimiento ≥ 60%', '✓' if df_cont['cumple'].mean() >= 0.6 else '✗', '1' if df_cont['cumple'].mean() >= 0.6 else '0'],
-        ['Satisfacción Cliente ≥ 80%', '✓' if kpis['Satisfacción Cliente'] >= 80 else '✗', '1' if kpis['Satisfacción Cliente'] >= 80 else '0'],
+        ['Disponibilidad ≥ 99.9%', marca[uptime_ok], str(int(uptime_ok))],
+        ['SLA Incidentes ≥ 90%', marca[sla_ok], str(int(sla_ok))],
+        ['Cumplimiento SLA COBIT ≥ 90%', marca[cobit_sla_ok], str(int(cobit_sla_ok))],
+        ['RTO Cumplimiento ≥ 60%', marca[rto_ok], str(int(rto_ok))],
+        ['Satisfacción Cliente ≥ 80%', marca[sat_ok], str(int(sat_ok))],
     ]
-    tm = Table(madurez_tabla, colWidths=[9*cm, 2*cm, 2*cm])
-    tm.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#2E75B6')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#BDC3C7')),
-        ('ALIGN', (1,0), (-1,-1), 'CENTER'),
-    ]))
-    story.append(tm)
+    story.append(_tabla(madurez_tabla, [9*cm, 2*cm, 2*cm], _ESTILO_TABLA_MADUREZ))
     story.append(Spacer(1, 0.5*cm))
 
 
-    # Recomendaciones
-    story.append(Paragraph('5. RECOMENDACIONES ESTRATÉGICAS', h1_style))
-    recomendaciones = [
-        '1. Implementar monitoreo proactivo 24/7 con alertas automatizadas para incidentes P1/P2.',
-        '2. Establecer réplica geográfica activo-activo para eliminar single points of failure en BD.',
-        '3. Actualizar el DRP con procedimientos específicos para ransomware con tiempo objetivo < 4h.',
-        '4. Crear un comité de Continuidad de Negocio con reuniones quincenales y KPIs formales.',
-        '5. Implementar chaos engineering para validar RTO en entornos de staging mensualmente.',
-        '6. Certificar el SMS bajo ISO/IEC 20000 para fortalecer la confianza de los clientes.',
-        '7. Aumentar la inversión en capacitación del equipo ITSM para reducir tiempo de resolución.',
-    ]
-    for r in recomendaciones:
-        story.append(Paragraph(r, normal))
-        story.append(Spacer(1, 0.15*cm))
+    story.append(Paragraph('5. RECOMENDACIONES ESTRATÉGICAS', _H1))
+    story.append(Paragraph('<br/>'.join(_RECOMENDACIONES), _NORMAL))
 
 
     story.append(Spacer(1, 0.3*cm))
-    story.append(HRFlowable(width='100%', thickness=1, color=colors.HexColor('#BDC3C7')))
-    story.append(Paragraph('Documento generado automáticamente por CloudCore SaaS — Sistema Integrado de Gestión TI', 
-                            ParagraphStyle('footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey)))
+    story.append(HRFlowable(width='100%', thickness=1, color=_GRIS))
+    story.append(Paragraph('Documento generado automáticamente por CloudCore SaaS — Sistema Integrado de Gestión TI', _PIE))
 
 
     doc.build(story)
+    with open(ruta_pdf, 'wb') as f:
+        f.write(buffer.getbuffer())
     print(f'✅ PDF generado: {ruta_pdf}')
     return ruta_pdf
 
@@ -349,10 +383,18 @@ if __name__ == '__main__':
     print('=' * 60)
 
 
-    df_inc, tasa_sla = modulo_incidentes()
-    df_disp, uptime = modulo_disponibilidad()
-    kpis = modulo_kpis()
-    df_cont = modulo_continuidad()
+    # Los módulos no comparten estado: cada uno corre en su propio proceso con un
+    # generador independiente derivado de la misma semilla
+    semillas = np.random.SeedSequence(42).spawn(3)
+    rng_inc, rng_disp, rng_cont = (np.random.default_rng(s) for s in semillas)
+    with ProcessPoolExecutor(max_workers=4) as ex:
+        futuros = [
+            ex.submit(modulo_incidentes, rng_inc),
+            ex.submit(modulo_disponibilidad, rng_disp),
+            ex.submit(modulo_kpis),
+            ex.submit(modulo_continuidad, rng_cont),
+        ]
+        (df_inc, tasa_sla), (df_disp, uptime), kpis, df_cont = [f.result() for f in futuros]
     puntaje, madurez_txt = calcular_madurez(tasa_sla, uptime, kpis, df_cont)
 
 
@@ -360,11 +402,16 @@ if __name__ == '__main__':
     print(f'📈 Uptime anual: {uptime}%')
     print(f'🎯 Madurez: {madurez_txt} ({puntaje}/5)')
     print(f'\nEscenarios Continuidad:')
-    print(df_cont[['nombre','rto_real','cumple','impacto_usd']].to_string(index=False))
+    mostrar(df_cont[['nombre','rto_real','cumple','impacto_usd']], 2)
 
 
-    dashboard_integrado(df_inc, df_disp, kpis, df_cont, tasa_sla, uptime, madurez_txt)
-    pdf = generar_pdf(tasa_sla, uptime, kpis, df_cont, puntaje, madurez_txt)
+    # Dashboard y PDF solo comparten las entradas ya calculadas: se generan en paralelo.
+    # El PDF no incrusta el dashboard: si solo se necesita el informe, se omite el gráfico
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        f_pdf = ex.submit(generar_pdf, tasa_sla, uptime, kpis, df_cont, puntaje, madurez_txt)
+        if os.getenv('CLOUDCORE_SKIP_DASHBOARD') != '1':
+            ex.submit(dashboard_integrado, df_inc, df_disp, kpis, df_cont, tasa_sla, uptime, madurez_txt).result()
+        pdf = f_pdf.result()
 
 
     print('\n' + '=' * 60)